@@ -0,0 +1,49 @@
+# benchmarks/bench_utils.py
+"""Helpers shared by the benchmark scripts."""
+import os
+import sys
+import platform
+import datetime
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def open_tk():
+    """(hidden Tk root, ImageTk) for PhotoImage stages, or (None, None) when Tk cannot start here."""
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+        return root, ImageTk
+    except Exception as e:
+        print(f"PhotoImage stages skipped: {e}")
+        return None, None
+
+
+def environment():
+    """Versions and revision recorded with every result file."""
+    import PIL
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        revision = None
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pillow': PIL.__version__,
+        'numpy': numpy_version,
+    }
@@ -0,0 +1,247 @@
+# benchmarks/render_benchmark.py
+"""
+Headless benchmark of the layer rendering pipeline.
+
+    python benchmarks/render_benchmark.py [--quick] [--repeat 3] [--output results.json]
+    python benchmarks/render_benchmark.py --compare old.json new.json
+
+Builds real ImageState layers from the SVG templates in Images/ and from
+synthetic large photos and renders them through core.render_engine.RenderEngine,
+the code behind Orthy.draw_image and the exports, over a grid of scales,
+angles, flips, transparency levels and render qualities. Every case reports
+per-stage times in milliseconds:
+
+    mip        picking (and on first use building) the mip level
+    vector     re-rasterizing an enlarged SVG from its vector source
+    resize     LANCZOS resize of the sampled part of the source
+    transform  the affine pass (rotation, flips, scale)
+    alpha      transparency LUT
+    photo      PhotoImage creation (only when Tk can open a display)
+
+Results are written as JSON so runs from two revisions can be compared.
+"""
+import os
+import sys
+import glob
+import json
+import argparse
+import itertools
+import statistics
+
+from PIL import Image
+
+from bench_utils import REPO_DIR, environment, open_tk  # also puts the repository root on sys.path
+from core.image_state import ImageState
+from core.rasterize import stage
+from core.render_engine import RenderEngine
+from core.svg_raster import rasterize_svg
+from core.tiles import should_tile
+
+VIEWPORT = (1920, 1080)
+# Exports larger than this are skipped rather than allocating gigabytes.
+MAX_EXPORT_PIXELS = 40 * 1024 * 1024
+# Layer names Orthy gives templates whose name changes how they are drawn.
+LAYER_NAMES = {'liniar_new_n2.svg': 'Ruler'}
+
+SYNTHETIC_PHOTOS = {
+    'photo_3000x2000': (3000, 2000),
+    'photo_6000x4000': (6000, 4000),
+}
+FULL_GRID = {
+    'scale': [0.5, 1.0, 2.0, 4.0],
+    'angle': [0, 30, 90],
+    'flip': ['none', 'horizontal', 'both'],
+    'transparency': [1.0, 0.2],
+    'quality': ['settled', 'interactive'],
+}
+QUICK_GRID = {
+    'scale': [0.5, 2.0],
+    'angle': [0, 30],
+    'flip': ['none', 'horizontal'],
+    'transparency': [0.2],
+    'quality': ['settled', 'interactive'],
+}
+
+
+def synthetic_photo(size):
+    """Noisy gradients: compress and resample like a photo, unlike a flat colour."""
+    red = Image.effect_noise(size, 48)
+    green = Image.linear_gradient('L').resize(size)
+    blue = Image.radial_gradient('L').resize(size)
+    return Image.merge('RGB', (red, green, blue)).convert('RGBA')
+
+
+def load_sources(include_svg=True, include_photos=True):
+    """{name: (RGBA image, SVG markup or None)} for templates and synthetic photos."""
+    sources = {}
+    if include_svg:
+        try:
+            for path in sorted(glob.glob(os.path.join(REPO_DIR, 'Images', '*.svg'))):
+                with open(path, 'r', encoding='utf-8') as svg_file:
+                    svg_content = svg_file.read()
+                sources[os.path.basename(path)] = (rasterize_svg(svg_content), svg_content)
+        except (ImportError, OSError) as e:
+            print(f"SVG templates skipped (cairosvg unavailable): {e}")
+    if include_photos:
+        for name, size in SYNTHETIC_PHOTOS.items():
+            sources[name] = (synthetic_photo(size), None)
+    return sources
+
+
+def make_layer(source_name, image, svg_content, params, viewport=VIEWPORT):
+    """A new ImageState (so with cold caches) transformed by params and centred in the viewport."""
+    image_state = ImageState(image, LAYER_NAMES.get(source_name, source_name), svg_content=svg_content)
+    image_state.scale = params['scale']
+    image_state.angle = params['angle']
+    image_state.is_flipped_horizontally = params['flip'] in ('horizontal', 'both')
+    image_state.is_flipped_vertically = params['flip'] in ('vertical', 'both')
+    image_state.image_transparency_level = params['transparency']
+    image_state.offset_x, image_state.offset_y = viewport[0] / 2, viewport[1] / 2
+    return image_state
+
+
+def draw_layer(engine, image_state, image_tk, viewport=VIEWPORT):
+    """
+    What Orthy.draw_image renders on a cache miss: the whole raster, or only
+    the tiles on screen when it dwarfs the viewport. Returns (raster size, tiles).
+    """
+    # Every run renders afresh; the mip levels and vector rasters stay warm.
+    image_state.render_cache.clear()
+    image_state.tile_cache.clear()
+    viewport_rect = (0, 0) + tuple(viewport)
+    layout = engine.layout(image_state, viewport_rect)
+    if should_tile(layout.size, viewport_rect):
+        tiles = engine.layer_tiles(layout, viewport_rect)
+        rasters = [engine.tile_raster(image_state, layout, *tile)[0] for tile in tiles]
+    else:
+        tiles = []
+        rasters = [engine.layer_raster(image_state, layout)[0]]
+    if image_tk:
+        for raster in rasters:
+            with stage(engine.stage_timings, 'photo'):
+                image_tk.PhotoImage(raster)
+    return layout.size, len(tiles)
+
+
+def export_layer(engine, image_state):
+    """What the export commands render: the whole layer at full quality. Returns (raster size, tiles)."""
+    size = image_state.get_raster_layout()[1]
+    if size[0] * size[1] > MAX_EXPORT_PIXELS:
+        return size, None
+    engine.export_image(image_state)
+    return size, 0
+
+
+def run_case(pipeline, source_name, image, svg_content, params, repeat, image_tk):
+    """
+    One grid case on a new layer: the first run, which builds the mip levels
+    it needs, is reported as cold_ms, the median of the next repeat runs as
+    median_ms and stages_ms.
+    """
+    engine = RenderEngine()
+    engine.interacting = params['quality'] == 'interactive'
+    image_state = make_layer(source_name, image, svg_content, params)
+    runs = []
+    size, tiles = None, 0
+    for _ in range(repeat + 1):
+        timings = engine.stage_timings = {}
+        with stage(timings, 'total'):
+            if pipeline == 'draw':
+                size, tiles = draw_layer(engine, image_state, image_tk)
+            else:
+                size, tiles = export_layer(engine, image_state)
+        if tiles is None:
+            return dict(params, pipeline=pipeline, raster_size=list(size), skipped=True)
+        runs.append(timings)
+
+    warm = runs[1:] or runs
+    stages = sorted({name for timings in warm for name in timings} - {'total'})
+    return dict(
+        params,
+        pipeline=pipeline,
+        raster_size=list(size),
+        tiles=tiles,
+        cold_ms=round(runs[0]['total'], 3),
+        median_ms=round(statistics.median(timings['total'] for timings in warm), 3),
+        stages_ms={name: round(statistics.median(timings.get(name, 0.0) for timings in warm), 3)
+                   for name in stages},
+    )
+
+
+def run(grid, repeat, include_svg=True, include_photos=True, include_photo_stage=True):
+    image_tk = None
+    root = None
+    if include_photo_stage:
+        root, image_tk = open_tk()
+    sources = load_sources(include_svg, include_photos)
+    keys = list(grid)
+    results = []
+    for source_name, (image, svg_content) in sources.items():
+        for values in itertools.product(*(grid[key] for key in keys)):
+            params = dict(zip(keys, values))
+            for pipeline in ('draw', 'export'):
+                if pipeline == 'export' and params['quality'] != 'settled':
+                    continue  # exports always render at full quality
+                result = run_case(pipeline, source_name, image, svg_content, params, repeat, image_tk)
+                result = dict(source=source_name, source_size=list(image.size), **result)
+                results.append(result)
+                if not result.get('skipped'):
+                    print(f"{source_name:>24} {pipeline:>6} scale={params['scale']:<4} "
+                          f"angle={params['angle']:<3} flip={params['flip']:<10} "
+                          f"alpha={params['transparency']:<4} {params['quality']:<11} "
+                          f"{result['median_ms']:9.2f} ms (cold {result['cold_ms']:.2f})")
+    if root:
+        root.destroy()
+    return {'environment': environment(), 'viewport': list(VIEWPORT), 'repeat': repeat,
+            'grid': grid, 'results': results}
+
+
+def case_key(result):
+    return (result['source'], result['pipeline'], result['scale'], result['angle'], result['flip'],
+            result['transparency'], result['quality'])
+
+
+def compare(old_path, new_path):
+    """Print the median time of every case found in both result files, and the ratio."""
+    with open(old_path, 'r', encoding='utf-8') as old_file:
+        old = {case_key(result): result for result in json.load(old_file)['results']}
+    with open(new_path, 'r', encoding='utf-8') as new_file:
+        new = {case_key(result): result for result in json.load(new_file)['results']}
+    ratios = []
+    for key in sorted(set(old) & set(new), key=str):
+        before, after = old[key].get('median_ms'), new[key].get('median_ms')
+        if not before or after is None:
+            continue
+        ratios.append(after / before)
+        print(f"{' '.join(str(part) for part in key):<90} {before:9.2f} -> {after:9.2f} ms "
+              f"({after / before:5.2f}x)")
+    if ratios:
+        print(f"{len(ratios)} cases, median ratio {statistics.median(ratios):.2f}x")
+    else:
+        print("No cases in common.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help="small grid for a fast check")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=os.path.join(REPO_DIR, 'bench_output.json'))
+    parser.add_argument('--no-svg', action='store_true', help="skip the SVG templates")
+    parser.add_argument('--no-photos', action='store_true', help="skip the synthetic photos")
+    parser.add_argument('--no-photoimage', action='store_true', help="skip the Tk PhotoImage stage")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    report = run(QUICK_GRID if args.quick else FULL_GRID, args.repeat,
+                 include_svg=not args.no_svg, include_photos=not args.no_photos,
+                 include_photo_stage=not args.no_photoimage)
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"{len(report['results'])} results written to {args.output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
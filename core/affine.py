@@ -0,0 +1,109 @@
+# core/affine.py
+import math
+
+
+class Affine:
+    """
+    2D affine transform in canvas coordinates (y axis pointing down):
+        x' = a*x + b*y + c
+        y' = d*x + e*y + f
+    Compose with the @ operator; (A @ B) applies B first, then A.
+    """
+    __slots__ = ('a', 'b', 'c', 'd', 'e', 'f')
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=0.0, e=1.0, f=0.0):
+        self.a, self.b, self.c = a, b, c
+        self.d, self.e, self.f = d, e, f
+
+    @classmethod
+    def identity(cls):
+        return cls()
+
+    @classmethod
+    def translation(cls, tx, ty):
+        return cls(1.0, 0.0, tx, 0.0, 1.0, ty)
+
+    @classmethod
+    def scaling(cls, sx, sy=None):
+        return cls(sx, 0.0, 0.0, 0.0, sx if sy is None else sy, 0.0)
+
+    @classmethod
+    def rotation(cls, degrees):
+        """Rotation that looks counterclockwise on screen, matching PIL's Image.rotate."""
+        radians = math.radians(degrees)
+        cos, sin = math.cos(radians), math.sin(radians)
+        return cls(cos, sin, 0.0, -sin, cos, 0.0)
+
+    def __matmul__(self, other):
+        return Affine(
+            self.a * other.a + self.b * other.d,
+            self.a * other.b + self.b * other.e,
+            self.a * other.c + self.b * other.f + self.c,
+            self.d * other.a + self.e * other.d,
+            self.d * other.b + self.e * other.e,
+            self.d * other.c + self.e * other.f + self.f,
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Affine) and self.coefficients() == other.coefficients()
+
+    def __hash__(self):
+        return hash(self.coefficients())
+
+    def __repr__(self):
+        return "Affine(%g, %g, %g, %g, %g, %g)" % self.coefficients()
+
+    def coefficients(self):
+        return (self.a, self.b, self.c, self.d, self.e, self.f)
+
+    def determinant(self):
+        return self.a * self.e - self.b * self.d
+
+    def scale_factor(self):
+        """Average linear scale (output pixels per input pixel)."""
+        return math.sqrt(abs(self.determinant()))
+
+    def apply(self, x, y):
+        return (self.a * x + self.b * y + self.c, self.d * x + self.e * y + self.f)
+
+    def inverse(self):
+        det = self.determinant()
+        if det == 0:
+            raise ValueError("Affine transform is not invertible.")
+        a, b, d, e = self.e / det, -self.b / det, -self.d / det, self.a / det
+        return Affine(a, b, -(a * self.c + b * self.f), d, e, -(d * self.c + e * self.f))
+
+    def linear(self):
+        """The same transform without its translation."""
+        return Affine(self.a, self.b, 0.0, self.d, self.e, 0.0)
+
+    def corners(self, width, height):
+        return [self.apply(x, y) for x, y in ((0, 0), (width, 0), (width, height), (0, height))]
+
+    def bounds(self, width, height):
+        """Axis-aligned bounding box (x0, y0, x1, y1) of a width x height rectangle."""
+        xs, ys = zip(*self.corners(width, height))
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def to_pil_data(self):
+        """Coefficients for Image.transform(..., Image.AFFINE), which maps output to input."""
+        return self.inverse().coefficients()
+
+    def to_svg(self):
+        return "matrix(%r,%r,%r,%r,%r,%r)" % (self.a, self.d, self.b, self.e, self.c, self.f)
+
+
+def layout_raster(matrix, width, height):
+    """
+    Split a source-to-canvas matrix into a bitmap that depends only on the
+    linear part, and the canvas position of that bitmap's top-left corner.
+    Pure translations therefore move the bitmap without re-rendering it.
+
+    Returns (render_matrix, (out_width, out_height), (x, y)).
+    """
+    linear = matrix.linear()
+    x0, y0, x1, y1 = linear.bounds(width, height)
+    left, top = math.floor(x0), math.floor(y0)
+    size = (max(1, math.ceil(x1) - left), max(1, math.ceil(y1) - top))
+    render_matrix = Affine.translation(-left, -top) @ linear
+    return render_matrix, size, (matrix.c + left, matrix.f + top)
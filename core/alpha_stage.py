@@ -0,0 +1,21 @@
+# core/alpha_stage.py
+from functools import lru_cache
+
+_IDENTITY_BAND = list(range(256))
+
+
+@lru_cache(maxsize=32)
+def transparency_lut(level):
+    """
+    Lookup table for Image.point on an RGBA image: colour bands pass through,
+    alpha is scaled by level. Built once per transparency level.
+    """
+    alpha_band = [int(p * level) for p in range(256)]
+    return tuple(_IDENTITY_BAND * 3 + alpha_band)
+
+
+def apply_transparency(image, level):
+    """Scale the alpha channel of an RGBA image by level in a single C pass."""
+    if level >= 1.0:
+        return image
+    return image.point(list(transparency_lut(level)))
@@ -0,0 +1,170 @@
+# core/compositor.py
+import logging
+
+from PIL import Image
+
+from core.dirty_rect import rect_union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the per-layer canvas path works without it.
+    np = None
+
+
+def numpy_available():
+    return np is not None
+
+
+def to_premultiplied(image):
+    """HxWx4 uint8 array of an RGBA image with premultiplied alpha (converted by PIL in C)."""
+    return np.asarray(image.convert('RGBa'))
+
+
+def layer_rect(layer, position):
+    """Frame rectangle (x0, y0, x1, y1) covered by a layer array drawn at position."""
+    x, y = int(position[0]), int(position[1])
+    return (x, y, x + layer.shape[1], y + layer.shape[0])
+
+
+def clip_to_rect(layer_size, position, rect):
+    """
+    Overlap of a layer drawn at position with a frame rectangle, as
+    (layer slices, frame slices), or None when they do not meet.
+    """
+    x, y = int(position[0]), int(position[1])
+    x0, y0 = max(x, rect[0]), max(y, rect[1])
+    x1, y1 = min(x + layer_size[0], rect[2]), min(y + layer_size[1], rect[3])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return ((slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)),
+            (slice(y0, y1), slice(x0, x1)))
+
+
+def blend_over(frame, layer, position, rect=None):
+    """
+    Blend a premultiplied layer over a premultiplied frame in place:
+    dst = src + dst * (1 - src_alpha), in 16-bit integer arithmetic.
+    rect limits the blend to part of the frame.
+    """
+    frame_rect = (0, 0, frame.shape[1], frame.shape[0])
+    if rect is not None:
+        frame_rect = (max(0, rect[0]), max(0, rect[1]), min(frame_rect[2], rect[2]), min(frame_rect[3], rect[3]))
+    clip = clip_to_rect((layer.shape[1], layer.shape[0]), position, frame_rect)
+    if clip is None:
+        return
+    (ly, lx), (fy, fx) = clip
+    src = layer[ly, lx]
+    dst = frame[fy, fx]
+    inverse_alpha = 255 - src[..., 3:4].astype(np.uint16)
+    blended = dst * inverse_alpha
+    blended += 127
+    blended //= 255
+    blended += src
+    frame[fy, fx] = blended
+
+
+class NumpyCompositor:
+    """
+    Blends rendered layers into one RGBA frame buffer the size of the viewport.
+
+    Layers are given as premultiplied uint8 arrays (see to_premultiplied) with
+    their canvas position, bottom layer first. The frame is kept premultiplied
+    and only converted back to straight alpha once, in to_image().
+
+    compose_stack() keeps the layers below and above the active one as two
+    cached sums. Premultiplied "over" is associative, so a frame is
+    base + active + above, and moving only the active layer re-blends just the
+    rectangle it left and the one it now covers.
+    """
+    def __init__(self, size=(1, 1)):
+        if np is None:
+            raise RuntimeError("NumPy is required for the compositing engine.")
+        self.size = None
+        self.frame = None
+        self.resize(size)
+        self.full_composites = 0
+        self.partial_composites = 0
+        self.skipped_composites = 0
+
+    def resize(self, size):
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        if size != self.size:
+            self.size = size
+            self.frame = np.zeros((size[1], size[0], 4), dtype=np.uint8)
+            self.invalidate()
+            logging.debug(f"Compositor frame buffer resized to {size[0]}x{size[1]}.")
+
+    def invalidate(self):
+        """Forget the cached sums; the next compose_stack() redraws everything."""
+        self._base = None
+        self._base_signature = None
+        self._above = None
+        self._above_signature = None
+        self._active_signature = None
+        self._active_rect = None
+
+    def clear(self):
+        self.frame.fill(0)
+
+    def compose(self, layers):
+        """Clear the frame and blend layers, an iterable of (array, position), bottom first."""
+        self.clear()
+        for layer, position in layers:
+            blend_over(self.frame, layer, position)
+        return self.frame
+
+    def compose_stack(self, below, active, above):
+        """
+        Composite below + active + above, reusing whatever did not change.
+        Each layer is (key, array, position); key must change whenever the
+        array's content does. active may be None. Returns False when the frame
+        is unchanged, else the frame rectangle that was redrawn.
+        """
+        below_signature = tuple((key, position) for key, _, position in below)
+        above_signature = tuple((key, position) for key, _, position in above)
+        active_signature = (active[0], active[2]) if active else None
+
+        full = False
+        if below_signature != self._base_signature:
+            self._base = self.compose([(array, position) for _, array, position in below]).copy()
+            self._base_signature = below_signature
+            full = True
+        if above_signature != self._above_signature:
+            self._above = (self.compose([(array, position) for _, array, position in above]).copy()
+                           if above else None)
+            self._above_signature = above_signature
+            full = True
+        if not full and active_signature == self._active_signature:
+            self.skipped_composites += 1
+            return False
+
+        active_rect = layer_rect(active[1], active[2]) if active else None
+        if full:
+            rect = (0, 0) + self.size
+            self.full_composites += 1
+        else:
+            rect = rect_union(self._active_rect, active_rect)
+            rect = (max(0, rect[0]), max(0, rect[1]), min(self.size[0], rect[2]), min(self.size[1], rect[3]))
+            self.partial_composites += 1
+        self._active_signature = active_signature
+        self._active_rect = active_rect
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            return rect
+
+        region = (slice(rect[1], rect[3]), slice(rect[0], rect[2]))
+        self.frame[region] = self._base[region]
+        if active:
+            blend_over(self.frame, active[1], active[2], rect)
+        if self._above is not None:
+            blend_over(self.frame, self._above, (0, 0), rect)
+        return rect
+
+    def to_image(self, frame=None):
+        """The frame as a straight-alpha RGBA PIL image, ready for a PhotoImage."""
+        frame = self.frame if frame is None else frame
+        return Image.frombuffer('RGBa', self.size, frame, 'raw', 'RGBa', 0, 1).convert('RGBA')
+
+    @property
+    def nbytes(self):
+        cached = [array for array in (self._base, self._above) if array is not None]
+        return self.frame.nbytes + sum(array.nbytes for array in cached)
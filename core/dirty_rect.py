@@ -0,0 +1,33 @@
+# core/dirty_rect.py
+"""Axis-aligned rectangles as (x0, y0, x1, y1) tuples, and a dirty-region accumulator."""
+
+
+def rects_intersect(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def rect_union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+class DirtyRegion:
+    """Bounding box of every area invalidated since the last frame."""
+    def __init__(self):
+        self.rect = None
+
+    def add(self, rect):
+        if rect is not None:
+            self.rect = rect_union(self.rect, rect)
+
+    def intersects(self, rect):
+        return self.rect is not None and rect is not None and rects_intersect(self.rect, rect)
+
+    def clear(self):
+        self.rect = None
+
+    def __bool__(self):
+        return self.rect is not None
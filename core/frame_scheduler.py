@@ -0,0 +1,96 @@
+# core/frame_scheduler.py
+import time
+import logging
+
+from core.dirty_rect import DirtyRegion
+
+DEFAULT_MAX_FPS = 60
+
+
+class FrameScheduler:
+    """
+    Coalesces redraw requests so the image canvas renders at most once per frame.
+
+    Callers mark layers dirty with request(); the first request schedules a frame
+    through after_idle (or after, when the FPS cap says it is too early) and any
+    further requests before that frame runs are folded into it. The render
+    callback receives a dict of {layer_name: content_changed} (None when every
+    layer has to be redrawn) and the DirtyRegion of canvas areas invalidated
+    since the last frame.
+    """
+    def __init__(self, widget, render_callback, max_fps=DEFAULT_MAX_FPS):
+        self.widget = widget
+        self.render_callback = render_callback
+        self.max_fps = max_fps
+        self.requested_frames = 0
+        self.rendered_frames = 0
+        self._dirty = {}
+        self._full_redraw = False
+        self._region = DirtyRegion()
+        self._pending_id = None
+        self._last_frame_time = 0.0
+
+    @property
+    def coalesced_frames(self):
+        """Requests that were folded into another frame instead of rendering their own."""
+        return self.requested_frames - self.rendered_frames - (1 if self._pending_id else 0)
+
+    def request(self, layer_name=None, content=True, region=None):
+        """
+        Mark a layer (or everything, when layer_name and region are both None)
+        dirty and make sure a frame is scheduled. content=False means only the
+        position changed; region is a canvas rectangle that needs refreshing.
+        """
+        self.requested_frames += 1
+        if region is not None:
+            self._region.add(region)
+        if layer_name is not None:
+            self._dirty[layer_name] = self._dirty.get(layer_name, False) or content
+        elif region is None:
+            self._full_redraw = True
+
+        if self._pending_id is not None:
+            return
+
+        delay_ms = 0
+        if self.max_fps:
+            frame_interval = 1.0 / self.max_fps
+            elapsed = time.perf_counter() - self._last_frame_time
+            delay_ms = int(max(0.0, frame_interval - elapsed) * 1000)
+        if delay_ms > 0:
+            self._pending_id = self.widget.after(delay_ms, self._run_frame)
+        else:
+            self._pending_id = self.widget.after_idle(self._run_frame)
+
+    def cancel(self):
+        """Drop the pending frame and all dirty state."""
+        if self._pending_id is not None:
+            try:
+                self.widget.after_cancel(self._pending_id)
+            except Exception as e:
+                logging.debug(f"Could not cancel pending frame: {e}")
+        self._pending_id = None
+        self._dirty = {}
+        self._full_redraw = False
+        self._region = DirtyRegion()
+
+    def stats(self):
+        return {
+            'requested': self.requested_frames,
+            'rendered': self.rendered_frames,
+            'coalesced': self.coalesced_frames,
+        }
+
+    def _run_frame(self):
+        self._pending_id = None
+        dirty = None if self._full_redraw else self._dirty
+        region = self._region
+        self._dirty = {}
+        self._full_redraw = False
+        self._region = DirtyRegion()
+        self._last_frame_time = time.perf_counter()
+        self.rendered_frames += 1
+        try:
+            self.render_callback(dirty, region)
+        except Exception as e:
+            logging.error(f"Error rendering frame: {e}")
@@ -0,0 +1,29 @@
+# core/hit_test.py
+DEFAULT_MASK_MAX_SIZE = 256
+DEFAULT_ALPHA_THRESHOLD = 16
+
+
+def build_alpha_mask(image, max_size=DEFAULT_MASK_MAX_SIZE):
+    """Downsampled copy of an RGBA image's alpha channel for per-pixel hit tests."""
+    mask = image.getchannel('A')
+    mask.thumbnail((max_size, max_size))
+    return mask
+
+
+def point_in_source(inverse_matrix, source_size, x, y):
+    """
+    Map canvas point (x, y) into source pixels through the inverse layer matrix.
+    Returns (u, v) when it lands inside the oriented bounding box, else None.
+    """
+    u, v = inverse_matrix.apply(x, y)
+    width, height = source_size
+    if 0 <= u <= width and 0 <= v <= height:
+        return u, v
+    return None
+
+
+def mask_hit(mask, source_size, u, v, threshold=DEFAULT_ALPHA_THRESHOLD):
+    """True if source point (u, v) is opaque enough in the downsampled alpha mask."""
+    mx = min(mask.width - 1, int(u * mask.width / source_size[0]))
+    my = min(mask.height - 1, int(v * mask.height / source_size[1]))
+    return mask.getpixel((mx, my)) >= threshold
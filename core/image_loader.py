@@ -0,0 +1,63 @@
+# core/image_loader.py
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_LOADER_WORKERS = 2
+DEFAULT_MAX_PENDING_LOADS = 4
+
+
+class AsyncImageLoader:
+    """
+    Runs image decoding on a small thread pool with a bounded number of
+    outstanding loads. Completion callbacks are handed back to the Tk thread
+    through widget.after, so they may touch widgets and application state.
+    """
+    def __init__(self, widget, max_workers=DEFAULT_LOADER_WORKERS, max_pending=DEFAULT_MAX_PENDING_LOADS):
+        self.widget = widget
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ImageLoader")
+        self._futures = set()
+
+    @property
+    def pending(self):
+        return len(self._futures)
+
+    def submit(self, function, *args, on_done=None):
+        """
+        Queue function(*args) on the pool. Returns its Future, or None when
+        max_pending loads are already outstanding. on_done(future) runs on the
+        Tk thread once the future completes.
+        """
+        if not self._slots.acquire(blocking=False):
+            logging.warning("Image load queue is full; request rejected.")
+            return None
+        future = self._executor.submit(function, *args)
+        self._futures.add(future)
+
+        def _finished(done_future):
+            self._slots.release()
+            if on_done is not None:
+                try:
+                    self.widget.after(0, self._deliver, done_future, on_done)
+                except Exception as e:
+                    logging.debug(f"Dropping image load result: {e}")
+            else:
+                self._futures.discard(done_future)
+
+        future.add_done_callback(_finished)
+        return future
+
+    def _deliver(self, future, on_done):
+        self._futures.discard(future)
+        on_done(future)
+
+    def cancel_pending(self):
+        """Cancel loads that have not started yet; running ones finish and are delivered."""
+        for future in list(self._futures):
+            future.cancel()
+
+    def shutdown(self):
+        self.cancel_pending()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,76 @@
+# core/image_memory.py
+import time
+import logging
+
+DEFAULT_IMAGE_MEMORY_BYTES = 512 * 1024 * 1024
+OVER_BUDGET_WARNING_INTERVAL = 60.0
+
+
+class ImageMemoryManager:
+    """
+    Keeps the caches derived from all layers' images within one global budget.
+
+    Layers report what they could free through releasable_bytes() and free it
+    through release_caches(). Working copies and the PhotoImages on screen are
+    never released here, so they do not count against max_bytes: a few large
+    working copies alone never cost the active layer its caches. When the
+    releasable total goes over max_bytes, caches are released from hidden
+    layers first, least recently drawn first, and only then from visible
+    ones. The caches of a layer a render worker is using are skipped.
+    """
+    def __init__(self, max_bytes=DEFAULT_IMAGE_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._last_warning = None
+
+    def touch(self, image_state):
+        """Record that a layer was just drawn."""
+        image_state.last_used = time.monotonic()
+
+    def total_bytes(self, images):
+        return sum(image_state.resident_bytes()['total'] for image_state in images.values())
+
+    def releasable_bytes(self, images):
+        return sum(image_state.releasable_bytes() for image_state in images.values())
+
+    def enforce(self, images, keep=None):
+        """
+        Release caches until the releasable bytes of images fit in the budget.
+        keep names a layer (usually the active one) whose caches are released
+        last of all. Returns the number of bytes freed.
+        """
+        releasable = self.releasable_bytes(images)
+        if releasable <= self.max_bytes:
+            return 0
+
+        candidates = sorted(
+            images.items(),
+            key=lambda item: (item[0] == keep, item[1].visible, item[1].last_used)
+        )
+        freed = 0
+        for image_name, image_state in candidates:
+            if releasable - freed <= self.max_bytes:
+                break
+            if not image_state.render_lock.acquire(blocking=False):
+                continue
+            try:
+                released = image_state.release_caches()
+            finally:
+                image_state.render_lock.release()
+            if released:
+                freed += released
+                self.evictions += 1
+                logging.debug(f"Released {released / 2**20:.1f} MB of caches from '{image_name}'.")
+        if releasable - freed > self.max_bytes:
+            self._warn_over_budget(releasable - freed)
+        return freed
+
+    def _warn_over_budget(self, remaining):
+        # Only render workers holding a layer's lock keep its caches resident,
+        # which lasts a frame or two; warn once a minute, not every frame.
+        now = time.monotonic()
+        if self._last_warning is not None and now - self._last_warning < OVER_BUDGET_WARNING_INTERVAL:
+            return
+        self._last_warning = now
+        logging.warning(f"Image caches still hold {remaining / 2**20:.1f} MB after eviction "
+                        f"(budget {self.max_bytes / 2**20:.1f} MB).")
@@ -0,0 +1,214 @@
+# core/image_state.py
+import logging
+import threading
+
+from PIL import Image
+
+from core.affine import Affine, layout_raster
+from core.render_cache import RenderCache, image_nbytes, DEFAULT_RENDER_CACHE_BYTES
+from core.mipmap import MipPyramid, DEFAULT_MIP_CACHE_BYTES
+from core.svg_raster import VectorRasterCache
+from core.hit_test import build_alpha_mask, point_in_source, mask_hit
+from core.tiles import DEFAULT_TILE_CACHE_BYTES
+
+
+class ImageState:
+    """Holds an image, its transformations, and its visibility state."""
+    __slots__ = (
+        'image_original', 'source_path', 'source_size', 'source_to_working',
+        'image_display', 'display_key', 'canvas_item_id', 'marker_item_id',
+        'render_cache', 'mip_pyramid', 'vector_cache', 'hit_mask', 'tile_cache', 'full_image',
+        'tiles', 'tile_tag', 'screen_bbox', 'culled', 'last_used', 'render_lock',
+        'name', 'visible', 'angle', 'scale', 'scale_log', 'offset_x', 'offset_y',
+        'rotation_point', 'is_flipped_horizontally', 'is_flipped_vertically',
+        'image_transparency_level', 'svg_content', 'display_scale',
+    )
+
+    def __init__(self, image_original, name, svg_content=None, source_path=None, source_size=None,
+                 render_cache_bytes=DEFAULT_RENDER_CACHE_BYTES, mip_cache_bytes=DEFAULT_MIP_CACHE_BYTES,
+                 tile_cache_bytes=DEFAULT_TILE_CACHE_BYTES):
+        # image_original is the working copy. Large photos are downscaled on
+        # load; the full-resolution file is only reopened for export.
+        self.image_original = image_original
+        self.source_path = source_path
+        self.source_size = source_size or image_original.size
+        self.source_to_working = Affine.scaling(image_original.width / self.source_size[0],
+                                                image_original.height / self.source_size[1])
+        self.image_display = None
+        self.display_key = None
+        self.canvas_item_id = None
+        self.marker_item_id = None
+        self.render_cache = RenderCache(render_cache_bytes)
+        self.mip_pyramid = MipPyramid(image_original, mip_cache_bytes)
+        self.vector_cache = VectorRasterCache(svg_content, image_original.size) if svg_content else None
+        self.hit_mask = None
+        self.tile_cache = RenderCache(tile_cache_bytes)
+        # Full-resolution source of a downscaled layer while it is zoomed past its working copy
+        self.full_image = None
+        # Large rasters are shown as {(col, row): (canvas item, PhotoImage, render key)}
+        self.tiles = {}
+        self.tile_tag = f"tiles-{id(self)}"
+        self.screen_bbox = None
+        self.culled = False
+        self.last_used = 0.0
+        # Held while a render uses the caches above (see RenderEngine.render_detached)
+        self.render_lock = threading.Lock()
+        self.name = name
+        self.visible = True
+        self.angle = 0
+        self.scale = 1.0
+        self.scale_log = 0
+        self.offset_x = 512
+        self.offset_y = 512
+        self.rotation_point = None
+        self.is_flipped_horizontally = False
+        self.is_flipped_vertically = False
+        self.image_transparency_level = 0.2
+        self.svg_content = svg_content
+        # Every image except the Ruler is drawn at an additional 70% scale.
+        self.display_scale = 1.0 if name == "Ruler" else 0.7
+
+    def get_source_matrix(self):
+        """
+        Affine transform from full-resolution source pixels to canvas
+        coordinates: centre the source, flip, scale, move to the offset, then
+        rotate about the pivot (the rotation point, or the offset when none is set).
+        """
+        width, height = self.source_size
+        pivot = self.rotation_point or (self.offset_x, self.offset_y)
+        scale = self.scale * self.display_scale
+        return (Affine.translation(*pivot)
+                @ Affine.rotation(self.angle)
+                @ Affine.translation(self.offset_x - pivot[0], self.offset_y - pivot[1])
+                @ Affine.scaling(-scale if self.is_flipped_horizontally else scale,
+                                 -scale if self.is_flipped_vertically else scale)
+                @ Affine.translation(-width / 2, -height / 2))
+
+    def get_matrix(self):
+        """Affine transform from working-copy pixels to canvas coordinates."""
+        return self.get_source_matrix() @ self.source_to_working.inverse()
+
+    @property
+    def is_downscaled(self):
+        return self.image_original.size != tuple(self.source_size)
+
+    def load_full_resolution(self):
+        """
+        The full-resolution source image: the working copy itself unless it was
+        downscaled on load, in which case the file is decoded again (not kept).
+        """
+        if not self.is_downscaled or not self.source_path:
+            return self.image_original
+        image = Image.open(self.source_path).convert("RGBA")
+        if image.size != tuple(self.source_size):
+            logging.warning(f"'{self.source_path}' changed on disk; exporting from the working copy.")
+            return self.image_original
+        return image
+
+    def full_resolution_source(self):
+        """
+        The full-resolution source to sample where the working copy would be
+        magnified: decoded on first use and kept until release_caches(). The
+        working copy itself when the layer is not downscaled or its file can
+        no longer be read.
+        """
+        if not self.is_downscaled:
+            return self.image_original
+        if self.full_image is None:
+            try:
+                self.full_image = self.load_full_resolution()
+            except Exception as e:
+                logging.error(f"Error reopening '{self.source_path}'; zooming in upsamples the working copy: {e}")
+                self.full_image = self.image_original
+        return self.full_image
+
+    def resident_bytes(self):
+        """Bytes of image data this layer currently holds in memory, by component."""
+        usage = {
+            'working_copy': image_nbytes(self.image_original),
+            'mip_levels': self.mip_pyramid.current_bytes,
+            'render_cache': self.render_cache.current_bytes,
+            'tile_cache': self.tile_cache.current_bytes,
+            'vector_cache': self.vector_cache.current_bytes if self.vector_cache else 0,
+            'hit_mask': image_nbytes(self.hit_mask) if self.hit_mask is not None else 0,
+            'full_resolution': (image_nbytes(self.full_image) if self.full_image is not None
+                                and self.full_image is not self.image_original else 0),
+            'display': sum(photo.width() * photo.height() * 4 for photo in self.display_photos()),
+        }
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def display_photos(self):
+        """PhotoImages currently showing this layer (one, or one per visible tile)."""
+        photos = [photo for _, photo, _ in self.tiles.values()]
+        if self.image_display is not None:
+            photos.append(self.image_display)
+        return photos
+
+    def releasable_bytes(self):
+        """Bytes release_caches() would free: everything but the working copy and display."""
+        usage = self.resident_bytes()
+        return usage['total'] - usage['working_copy'] - usage['display']
+
+    def release_caches(self):
+        """
+        Drop every buffer derived from the working copy (renders, tiles, mip
+        levels, vector rasters, hit mask) and the full-resolution source; all
+        are rebuilt on demand.
+        Returns the number of bytes released.
+        """
+        released = self.releasable_bytes()
+        self.render_cache.clear()
+        self.tile_cache.clear()
+        self.mip_pyramid.clear()
+        if self.vector_cache:
+            self.vector_cache.clear()
+        self.hit_mask = None
+        self.full_image = None
+        return released
+
+    def get_raster_layout(self):
+        """(render_matrix, size, canvas position) of this layer's bitmap."""
+        return layout_raster(self.get_matrix(), *self.image_original.size)
+
+    def get_oriented_box(self):
+        """Canvas corners of the transformed image, in drawing order."""
+        return self.get_matrix().corners(*self.image_original.size)
+
+    def get_hit_mask(self):
+        """Downsampled alpha mask, built on first per-pixel hit test."""
+        if self.hit_mask is None:
+            self.hit_mask = build_alpha_mask(self.image_original)
+        return self.hit_mask
+
+    def contains_point(self, x, y, per_pixel=False):
+        """
+        True if canvas point (x, y) falls on the image as drawn: inside its
+        oriented bounding box and, with per_pixel, on a non-transparent pixel.
+        """
+        source_point = point_in_source(self.get_matrix().inverse(), self.image_original.size, x, y)
+        if source_point is None:
+            return False
+        if per_pixel:
+            return mask_hit(self.get_hit_mask(), self.image_original.size, *source_point)
+        return True
+
+    def translate(self, dx, dy):
+        """Move the image, carrying its rotation point along with it."""
+        self.offset_x += dx
+        self.offset_y += dy
+        if self.rotation_point:
+            self.rotation_point = (self.rotation_point[0] + dx, self.rotation_point[1] + dy)
+
+    def set_rotation_point(self, point):
+        """Change (or clear, with None) the pivot without moving the image on screen."""
+        rotation = Affine.rotation(self.angle)
+        pivot = self.rotation_point or (self.offset_x, self.offset_y)
+        tx, ty = rotation.apply(self.offset_x - pivot[0], self.offset_y - pivot[1])
+        tx, ty = tx + pivot[0], ty + pivot[1]
+        if point is None:
+            self.offset_x, self.offset_y = tx, ty
+        else:
+            ox, oy = rotation.inverse().apply(tx - point[0], ty - point[1])
+            self.offset_x, self.offset_y = point[0] + ox, point[1] + oy
+        self.rotation_point = point
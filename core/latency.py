@@ -0,0 +1,164 @@
+# core/latency.py
+import json
+import time
+import datetime
+from collections import deque
+
+DEFAULT_LATENCY_SAMPLES = 1000
+PERCENTILES = (50, 95, 99)
+
+
+def nearest_rank(ordered, p):
+    """p-th percentile of an already sorted, non-empty list."""
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+class RollingHistogram:
+    """The last max_samples values of one metric, in milliseconds."""
+    def __init__(self, max_samples=DEFAULT_LATENCY_SAMPLES):
+        self.count = 0
+        self._samples = deque(maxlen=max_samples)
+
+    def add(self, value):
+        self._samples.append(value)
+        self.count += 1
+
+    def summary(self):
+        summary = {'count': self.count, 'samples': len(self._samples)}
+        if self._samples:
+            ordered = sorted(self._samples)
+            for p in PERCENTILES:
+                summary[f'p{p}'] = round(nearest_rank(ordered, p), 3)
+            summary['max'] = round(ordered[-1], 3)
+        return summary
+
+    def samples(self):
+        return list(self._samples)
+
+
+class LatencyMonitor:
+    """
+    Times the path from an input event to pixels on screen.
+
+    Input sources call input_event() where the event arrives (on a pynput
+    thread or in a Tk handler) and pass the token to dispatched() once the
+    Tk thread handles it; record_input() does both for Tk's own events.
+    Orthy brackets every frame with frame_started() and frame_finished(),
+    and presented() runs from after_idle once Tk has redrawn the canvas.
+    Inputs handled before a frame are charged to that frame:
+
+        dispatch  input callback -> Tk handler (the after(0) queue)
+        queue     Tk handler -> frame start (frame scheduler)
+        frame     the frame callback: drawing, PhotoImages, canvas items
+        present   frame end -> Tk's idle redraw done
+        input     input callback -> present, end to end
+
+    Stages timed with core.rasterize.stage(monitor.frame_timings, name)
+    inside a frame, and anything passed to add(), get histograms of their
+    own. Nothing is recorded while enabled is False.
+    """
+    def __init__(self, max_samples=DEFAULT_LATENCY_SAMPLES):
+        self.enabled = False
+        self.max_samples = max_samples
+        self.histograms = {}
+        # Per-stage times of the running frame; None outside frames (stage() is then a no-op)
+        self.frame_timings = None
+        self._dispatched = []
+        self._frame = None
+        self._presents = deque(maxlen=120)
+
+    def add(self, name, value_ms):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.max_samples)
+        histogram.add(value_ms)
+
+    def reset(self):
+        self.histograms.clear()
+        self._dispatched = []
+        self._frame = None
+        self.frame_timings = None
+        self._presents.clear()
+
+    def input_event(self, source):
+        """Token for an input arriving now, or None when disabled. Safe from any thread."""
+        if not self.enabled:
+            return None
+        return (source, time.perf_counter())
+
+    def dispatched(self, token):
+        """The Tk thread is handling the input behind token."""
+        if token is not None and self.enabled:
+            self._dispatched.append(token + (time.perf_counter(),))
+
+    def record_input(self, source):
+        """An input that arrived as a Tk event, so it is dispatched as it arrives."""
+        self.dispatched(self.input_event(source))
+
+    def frame_started(self):
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        inputs, self._dispatched = self._dispatched, []
+        for _, input_time, dispatch_time in inputs:
+            self.add('dispatch', (dispatch_time - input_time) * 1000)
+            self.add('queue', (start - dispatch_time) * 1000)
+        self._frame = (start, inputs)
+        self.frame_timings = {}
+
+    def frame_finished(self, widget):
+        """Record the frame and its stages; widget.after_idle reports when Tk has drawn it."""
+        if self._frame is None:
+            return
+        end = time.perf_counter()
+        start, inputs = self._frame
+        self.add('frame', (end - start) * 1000)
+        for name, value in self.frame_timings.items():
+            self.add(name, value)
+        self._frame = None
+        self.frame_timings = None
+        widget.after_idle(self.presented, end, inputs)
+
+    def presented(self, frame_end, inputs):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.add('present', (now - frame_end) * 1000)
+        for _, input_time, _ in inputs:
+            self.add('input', (now - input_time) * 1000)
+        self._presents.append(now)
+
+    def fps(self):
+        """Frames presented per second over the last couple of seconds."""
+        if len(self._presents) < 2:
+            return 0.0
+        recent = [t for t in self._presents if t >= self._presents[-1] - 2.0]
+        span = recent[-1] - recent[0]
+        return (len(recent) - 1) / span if span > 0 else 0.0
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def report_lines(self, names=('input', 'dispatch', 'queue', 'frame', 'present', 'render_job')):
+        """Short text lines for the on-canvas HUD."""
+        lines = [f"{self.fps():5.1f} fps"]
+        for name in names:
+            histogram = self.histograms.get(name)
+            samples = sorted(histogram.samples()) if histogram else None
+            if not samples:
+                continue
+            p50, p95, p99 = (nearest_rank(samples, p) for p in PERCENTILES)
+            lines.append(f"{name:<10} p50 {p50:6.1f}  p95 {p95:6.1f}  p99 {p99:6.1f} ms")
+        return lines
+
+    def dump(self, path):
+        """Write the summary and the retained samples of every metric as JSON."""
+        report = {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'summary': self.summary(),
+            'samples_ms': {name: [round(v, 3) for v in histogram.samples()]
+                           for name, histogram in sorted(self.histograms.items())},
+        }
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        return path
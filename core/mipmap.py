@@ -0,0 +1,71 @@
+# core/mipmap.py
+import math
+import logging
+from collections import OrderedDict
+
+from core.render_cache import image_nbytes
+
+DEFAULT_MIP_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class MipPyramid:
+    """
+    Lazily populated power-of-two reductions of a source image.
+
+    Level 0 is the source itself; level n is reduced by 2**n. Levels are built
+    on first use from the nearest larger level that is already resident, and
+    the least recently used ones are freed once the pyramid exceeds max_bytes.
+    """
+    def __init__(self, source, max_bytes=DEFAULT_MIP_CACHE_BYTES):
+        self.source = source
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._levels = OrderedDict()
+
+    def level_for_scale(self, scale):
+        """Smallest level that is still at least as large as the requested scale."""
+        if scale >= 1.0 or scale <= 0:
+            return 0
+        level = int(math.floor(math.log2(1.0 / scale)))
+        # Stop before the level would collapse to a single pixel.
+        max_level = int(math.floor(math.log2(max(1, min(self.source.size)))))
+        return max(0, min(level, max_level))
+
+    def get_level(self, level):
+        """Return (image, (factor_x, factor_y)) where factor maps source pixels to level pixels."""
+        if level <= 0:
+            return self.source, (1.0, 1.0)
+
+        image = self._levels.get(level)
+        if image is None:
+            base_level = max([lvl for lvl in self._levels if lvl < level], default=0)
+            base = self._levels[base_level] if base_level else self.source
+            # Reduce premultiplied so transparent pixels don't darken the edges.
+            image = base.convert('RGBa').reduce(2 ** (level - base_level)).convert('RGBA')
+            self._levels[level] = image
+            self.current_bytes += image_nbytes(image)
+            logging.debug(f"Built mip level {level} ({image.width}x{image.height}).")
+            self.evict(self.max_bytes, keep=level)
+        else:
+            self._levels.move_to_end(level)
+
+        return image, (image.width / self.source.width, image.height / self.source.height)
+
+    def get_level_for_scale(self, scale):
+        return self.get_level(self.level_for_scale(scale))
+
+    def evict(self, target_bytes, keep=None):
+        """Free least recently used levels until the pyramid fits in target_bytes."""
+        for level in list(self._levels):
+            if self.current_bytes <= target_bytes:
+                break
+            if level == keep:
+                continue
+            self.current_bytes -= image_nbytes(self._levels.pop(level))
+
+    def clear(self):
+        self._levels.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._levels)
@@ -0,0 +1,63 @@
+# core/photo_pool.py
+import logging
+from collections import OrderedDict
+
+from PIL import ImageTk
+
+DEFAULT_MAX_FREE_PHOTOS = 8
+
+
+class PhotoImagePool:
+    """
+    Recycles ImageTk.PhotoImage objects keyed by size, so same-sized frames are
+    written with PhotoImage.paste instead of creating and destroying a Tk image.
+    Only the free list is held here; photos in use belong to their layers.
+    """
+    def __init__(self, max_free=DEFAULT_MAX_FREE_PHOTOS):
+        self.max_free = max_free
+        self.created = 0
+        self.reused = 0
+        self._free = OrderedDict()
+
+    def acquire(self, image):
+        """Return a PhotoImage showing image, recycled from the pool when possible."""
+        size = image.size
+        free_photos = self._free.get(size)
+        if free_photos:
+            photo = free_photos.pop()
+            if not free_photos:
+                del self._free[size]
+            photo.paste(image)
+            self.reused += 1
+            return photo
+        self.created += 1
+        return ImageTk.PhotoImage(image)
+
+    def release(self, photo):
+        """Give back a PhotoImage that is no longer displayed."""
+        if photo is None:
+            return
+        size = (photo.width(), photo.height())
+        self._free.setdefault(size, []).append(photo)
+        self._free.move_to_end(size)
+        while sum(len(photos) for photos in self._free.values()) > self.max_free:
+            oldest_size = next(iter(self._free))
+            self._free[oldest_size].pop(0)
+            if not self._free[oldest_size]:
+                del self._free[oldest_size]
+
+    def update(self, photo, image):
+        """
+        Show image through photo: paste in place when the size matches, otherwise
+        swap photo for a pooled one of the right size. Returns the photo to use.
+        """
+        if photo is not None and (photo.width(), photo.height()) == image.size:
+            photo.paste(image)
+            self.reused += 1
+            return photo
+        self.release(photo)
+        return self.acquire(image)
+
+    def clear(self):
+        self._free.clear()
+        logging.debug(f"PhotoImage pool cleared (created {self.created}, reused {self.reused}).")
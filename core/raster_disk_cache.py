@@ -0,0 +1,128 @@
+# core/raster_disk_cache.py
+import os
+import json
+import struct
+import hashlib
+import logging
+import threading
+
+from PIL import Image
+
+DEFAULT_DISK_CACHE_BYTES = 256 * 1024 * 1024
+ENTRY_MAGIC = b'ORTHYRC1'
+ENTRY_HEADER = struct.Struct('<II')
+INDEX_FILENAME = 'index.json'
+
+
+class RasterDiskCache:
+    """
+    Persistent cache of rasterized SVGs stored as raw RGBA buffers.
+
+    Entries are keyed by a hash of the SVG content, the render scale and a salt
+    (the renderer version), so an edited file simply misses. The index also
+    remembers which key each source path last produced and deletes the old
+    entry when that file changes. Least recently used entries are evicted once
+    the directory grows past max_bytes.
+    """
+    def __init__(self, cache_dir, max_bytes=DEFAULT_DISK_CACHE_BYTES, salt=''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.salt = salt
+        self._lock = threading.Lock()
+        self._index = {}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+            if os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as index_file:
+                    self._index = json.load(index_file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Raster cache index unavailable at {self.cache_dir}: {e}")
+            self._index = {}
+
+    def make_key(self, content, scale=1.0):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content)
+        digest.update(f"|{scale!r}|{self.salt}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + '.rgba')
+
+    def load(self, key):
+        """Return the cached RGBA image for key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as entry_file:
+                if entry_file.read(len(ENTRY_MAGIC)) != ENTRY_MAGIC:
+                    raise ValueError("bad header")
+                width, height = ENTRY_HEADER.unpack(entry_file.read(ENTRY_HEADER.size))
+                image = Image.frombytes('RGBA', (width, height), entry_file.read())
+            os.utime(path)
+            return image
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logging.warning(f"Discarding unreadable raster cache entry {key}: {e}")
+            self._remove(key)
+            return None
+
+    def store(self, key, image, source_path=None):
+        """Write image under key, retire the entry previously produced by source_path, then evict."""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as entry_file:
+                entry_file.write(ENTRY_MAGIC)
+                entry_file.write(ENTRY_HEADER.pack(image.width, image.height))
+                entry_file.write(image.convert('RGBA').tobytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write raster cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            if source_path:
+                source_key = os.path.normcase(os.path.abspath(source_path))
+                previous = self._index.get(source_key)
+                self._index[source_key] = key
+                if previous and previous != key:
+                    self._remove(previous)
+                self._write_index()
+            self._evict()
+
+    def _remove(self, key):
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _write_index(self):
+        index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+        try:
+            with open(index_path + '.tmp', 'w', encoding='utf-8') as index_file:
+                json.dump(self._index, index_file)
+            os.replace(index_path + '.tmp', index_path)
+        except OSError as e:
+            logging.warning(f"Could not write raster cache index: {e}")
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.rgba'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, filename))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename[:-len('.rgba')]))
+            total += stat.st_size
+        entries.sort()
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            logging.debug(f"Evicted raster cache entry {key}.")
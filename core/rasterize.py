@@ -0,0 +1,119 @@
+# core/rasterize.py
+import math
+import time
+from contextlib import contextmanager
+
+from PIL import Image
+
+from core.affine import Affine
+
+
+@contextmanager
+def stage(timings, name):
+    """Add the time spent in the block, in milliseconds, to timings[name] (if timings is a dict)."""
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def rasterize(mip_pyramid, original_size, render_matrix, size, resample=Image.LANCZOS,
+              vector_cache=None, timings=None):
+    """
+    Rasterize a layer (fully opaque) in a single affine pass. render_matrix
+    maps original_size source pixels to the output raster. Minified layers
+    sample from the nearest larger mip level, so the cost follows the output
+    size rather than the source size; with vector_cache, enlarged SVGs are
+    re-rasterized from their vector source instead of being upsampled.
+    """
+    scale = render_matrix.scale_factor()
+    with stage(timings, 'mip'):
+        source, (factor_x, factor_y) = mip_pyramid.get_level_for_scale(scale)
+    if resample == Image.LANCZOS and scale > 1.0 and vector_cache:
+        with stage(timings, 'vector'):
+            vector_raster = vector_cache.get(scale)
+        if vector_raster:
+            source, (factor_x, factor_y) = vector_raster
+    level_matrix = render_matrix @ Affine.scaling(1 / factor_x, 1 / factor_y)
+    return transform_source(source, level_matrix, size, resample, original_size, scale, timings)
+
+
+def transform_source(source, level_matrix, size, resample, original_size, scale, timings=None):
+    """
+    Draw source through level_matrix into a size raster. source is
+    original_size scaled by some factor (a mip level or vector raster) and
+    scale is the output scale relative to original_size.
+    """
+    if resample == Image.LANCZOS:
+        # Image.transform has no LANCZOS filter: resize the mip level to the
+        # target scale with LANCZOS, then rotate and flip with BICUBIC.
+        original_width, original_height = original_size
+        target_size = (max(1, round(original_width * scale)), max(1, round(original_height * scale)))
+        if target_size != source.size:
+            with stage(timings, 'resize'):
+                source, level_matrix = resize_for_output(
+                    source, level_matrix, target_size, size, original_size
+                )
+            if source is None:
+                return Image.new('RGBA', size, (0, 0, 0, 0))
+        resample = Image.BICUBIC
+    with stage(timings, 'transform'):
+        source, level_matrix = crop_for_output(source, level_matrix, size)
+        if source is None:
+            return Image.new('RGBA', size, (0, 0, 0, 0))
+        return source.transform(
+            size, Image.AFFINE, level_matrix.to_pil_data(), resample=resample
+        )
+
+
+def crop_for_output(source, level_matrix, output_size, margin=3):
+    """
+    Crop source to the pixels a size output drawn through level_matrix
+    samples (plus margin pixels for the filter), since Pillow premultiplies
+    the whole of an RGBA image before transforming it. Returns (crop, matrix
+    from crop pixels to output), or (None, None) when the output does not
+    touch the source.
+    """
+    x0, y0, x1, y1 = level_matrix.inverse().bounds(*output_size)
+    box = (max(0, math.floor(x0) - margin), max(0, math.floor(y0) - margin),
+           min(source.width, math.ceil(x1) + margin), min(source.height, math.ceil(y1) + margin))
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return None, None
+    if box == (0, 0) + source.size:
+        return source, level_matrix
+    return source.crop(box), level_matrix @ Affine.translation(box[0], box[1])
+
+
+def resize_for_output(source, level_matrix, target_size, output_size, original_size):
+    """
+    LANCZOS-resize only the part of source that an output_size raster
+    drawn through level_matrix samples from, on the pixel grid of a full
+    resize to target_size, so tiles of one layer line up without seams.
+    Returns (resized crop, matrix from crop pixels to output), or
+    (None, None) when the output does not touch the source.
+    """
+    source_to_target = Affine.scaling(target_size[0] / original_size[0], target_size[1] / original_size[1])
+    level_to_target = source_to_target @ Affine.scaling(original_size[0] / source.width,
+                                                        original_size[1] / source.height)
+    x0, y0, x1, y1 = (level_to_target @ level_matrix.inverse()).bounds(*output_size)
+    # A few pixels of margin cover the BICUBIC footprint of the second pass.
+    box = (max(0, math.floor(x0) - 3), max(0, math.floor(y0) - 3),
+           min(target_size[0], math.ceil(x1) + 3), min(target_size[1], math.ceil(y1) + 3))
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return None, None
+    to_level = level_to_target.inverse()
+    source_box = to_level.apply(box[0], box[1]) + to_level.apply(box[2], box[3])
+    # resize() premultiplies all of an RGBA source, so first crop to the box
+    # plus the LANCZOS support (3 source pixels per output pixel when reducing).
+    margin = math.ceil(3 * max(1.0, source.width / target_size[0], source.height / target_size[1])) + 1
+    crop_box = (max(0, math.floor(source_box[0]) - margin), max(0, math.floor(source_box[1]) - margin),
+                min(source.width, math.ceil(source_box[2]) + margin),
+                min(source.height, math.ceil(source_box[3]) + margin))
+    source_box = (source_box[0] - crop_box[0], source_box[1] - crop_box[1],
+                  source_box[2] - crop_box[0], source_box[3] - crop_box[1])
+    crop = source.crop(crop_box).resize((box[2] - box[0], box[3] - box[1]), Image.LANCZOS, box=source_box)
+    return crop, level_matrix @ to_level @ Affine.translation(box[0], box[1])
@@ -0,0 +1,67 @@
+# core/render_cache.py
+import logging
+import threading
+from collections import OrderedDict
+
+DEFAULT_RENDER_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def image_nbytes(image):
+    """Approximate number of bytes held by a PIL image."""
+    return image.width * image.height * len(image.getbands())
+
+
+class RenderCache:
+    """
+    LRU cache of rendered layer bitmaps, bounded by a byte budget.
+    Keys describe the transform that produced the bitmap, so a layer whose
+    transform has not changed can reuse its last render. Safe to share
+    between the Tk thread and render workers.
+    """
+    def __init__(self, max_bytes=DEFAULT_RENDER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, image):
+        nbytes = image_nbytes(image)
+        if nbytes > self.max_bytes:
+            logging.debug(f"Render of {nbytes} bytes exceeds cache budget; not cached.")
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (image, nbytes)
+            self.current_bytes += nbytes
+            self.evict(self.max_bytes)
+
+    def evict(self, target_bytes):
+        """Drop least recently used entries until the cache fits in target_bytes."""
+        with self._lock:
+            while self._entries and self.current_bytes > target_bytes:
+                _, (_, nbytes) = self._entries.popitem(last=False)
+                self.current_bytes -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
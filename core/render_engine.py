@@ -0,0 +1,359 @@
+# core/render_engine.py
+import math
+from collections import namedtuple
+
+from PIL import Image
+
+from core.affine import Affine
+from core.alpha_stage import apply_transparency
+from core.compositor import NumpyCompositor, numpy_available, to_premultiplied
+from core.dirty_rect import rects_intersect
+from core.rasterize import rasterize, stage, transform_source
+from core.tiles import should_tile, tile_rect, visible_tiles, DEFAULT_TILE_SIZE
+
+# render_matrix/size/position as returned by layout_raster; geometry is the
+# rounded (coefficients, size) tuple that render cache keys are built from.
+# resample and level snapshot the filter and transparency to render with, so
+# a layout can be rendered on another thread while the layer keeps changing.
+LayerLayout = namedtuple('LayerLayout', 'render_matrix size position geometry resample level')
+
+
+class RenderEngine:
+    """
+    Turns ImageState layers into pixels without touching Tk.
+
+    The engine owns render quality, the layer/tile caches' keys, viewport
+    clipping, compositing and exports, and returns PIL images (or
+    premultiplied NumPy arrays for the compositor). Orthy only decides when to
+    draw and shows the results on its canvas, so benchmarks, batch exports
+    and worker threads can use the engine on its own.
+    """
+    def __init__(self, memory_manager=None, tile_size=DEFAULT_TILE_SIZE):
+        # Cheap filter while input arrives, full quality once settled
+        self.interactive_resample = Image.BILINEAR
+        self.settle_resample = Image.LANCZOS
+        self.interacting = False
+        self.vector_render_enabled = True
+        self.tile_size = tile_size
+        self.memory_manager = memory_manager
+        self.compositor = None
+        self._composite_sources = {}
+        # Per-stage render times (see core.rasterize.stage) for single-threaded
+        # callers such as the benchmarks; None, and not timed, in the app.
+        self.stage_timings = None
+
+    def render_resample(self):
+        return self.interactive_resample if self.interacting else self.settle_resample
+
+    @staticmethod
+    def layer_cache_key(geometry, resample, level):
+        """Render cache key; fully opaque renders share the key of the plain raster."""
+        key = geometry + (resample,)
+        return key if level >= 1.0 else key + (level,)
+
+    def current_keys(self, layout, suffix=()):
+        """(settled key, key for the layout's filter): a display showing either is up to date."""
+        return (self.layer_cache_key(layout.geometry, self.settle_resample, layout.level) + suffix,
+                self.layer_cache_key(layout.geometry, layout.resample, layout.level) + suffix)
+
+    ########################################################################
+    # Layers
+    ########################################################################
+    def layout(self, image_state, viewport=None):
+        """
+        LayerLayout of a layer, recording its screen bounding box. With a
+        viewport, a layer entirely outside it is marked culled and None is
+        returned, so it is never rasterized.
+        """
+        render_matrix, size, position = image_state.get_raster_layout()
+        image_state.screen_bbox = (position[0], position[1], position[0] + size[0], position[1] + size[1])
+        if viewport is not None:
+            image_state.culled = not rects_intersect(image_state.screen_bbox, viewport)
+            if image_state.culled:
+                return None
+        if self.memory_manager:
+            self.memory_manager.touch(image_state)
+        geometry = (tuple(round(v, 9) for v in render_matrix.coefficients()), size)
+        return LayerLayout(render_matrix, size, position, geometry,
+                           self.render_resample(), image_state.image_transparency_level)
+
+    def layer_raster(self, image_state, layout):
+        """
+        (image, render key) of a whole layer: the cached settled render when
+        there is one, else a fresh render with the current filter. Only
+        settled renders are stored.
+        """
+        cached = self.cached_layer(image_state, layout)
+        if cached:
+            return cached
+        settled_key, render_key = self.current_keys(layout)
+        img = self.render_layer(image_state, layout, layout.resample, cache=render_key == settled_key)
+        return img, render_key
+
+    def cached_layer(self, image_state, layout):
+        """(image, key) of the layer's settled render if it is cached, else None."""
+        settled_key = self.current_keys(layout)[0]
+        img = image_state.render_cache.get(settled_key)
+        return (img, settled_key) if img is not None else None
+
+    def render_detached(self, image_state, layout):
+        """layer_raster holding the layer's render lock, so it may run on a render worker."""
+        with image_state.render_lock:
+            return self.layer_raster(image_state, layout)
+
+    def render_layer(self, image_state, layout, resample, cache=True):
+        """
+        Two cached stages: the opaque raster for this geometry, then the alpha
+        stage for the layer's transparency level. Changing only transparency
+        reuses the raster and costs one LUT pass.
+        """
+        raster_key = self.layer_cache_key(layout.geometry, resample, 1.0)
+        raster = image_state.render_cache.get(raster_key) if cache else None
+        if raster is None:
+            raster = self.rasterize_image(image_state, layout.render_matrix, layout.size, resample)
+            if cache:
+                image_state.render_cache.put(raster_key, raster)
+
+        with stage(self.stage_timings, 'alpha'):
+            img = apply_transparency(raster, layout.level)
+        if cache and layout.level < 1.0:
+            image_state.render_cache.put(self.layer_cache_key(layout.geometry, resample, layout.level), img)
+        return img
+
+    def layer_tiles(self, layout, viewport):
+        """(col, row) of the layer's tiles that meet the viewport."""
+        return visible_tiles(layout.size, layout.position, viewport, self.tile_size)
+
+    def tile_rect(self, layout, col, row):
+        return tile_rect(col, row, layout.size, self.tile_size)
+
+    def tile_raster(self, image_state, layout, col, row):
+        """(image, render key) of one tile, from the layer's tile cache when settled."""
+        cached = self.cached_tile(image_state, layout, col, row)
+        if cached:
+            return cached
+        settled_key, render_key = self.current_keys(layout, (col, row))
+        img = self.render_crop(image_state, layout, self.tile_rect(layout, col, row))
+        if render_key == settled_key:
+            image_state.tile_cache.put(settled_key, img)
+        return img, render_key
+
+    def cached_tile(self, image_state, layout, col, row):
+        """(image, key) of a settled tile if it is cached, else None."""
+        settled_key = self.current_keys(layout, (col, row))[0]
+        img = image_state.tile_cache.get(settled_key)
+        return (img, settled_key) if img is not None else None
+
+    def render_tiles_detached(self, image_state, layout, tiles):
+        """{(col, row): (image, render key)} of tiles, for a render worker (see render_detached)."""
+        with image_state.render_lock:
+            return {tile: self.tile_raster(image_state, layout, *tile) for tile in tiles}
+
+    def render_image(self, image_state, render_matrix, size, resample=Image.LANCZOS, level=None):
+        """Rasterize image_state, then apply level (by default its current transparency)."""
+        img = self.rasterize_image(image_state, render_matrix, size, resample)
+        if level is None:
+            level = image_state.image_transparency_level
+        with stage(self.stage_timings, 'alpha'):
+            return apply_transparency(img, level)
+
+    def rasterize_image(self, image_state, render_matrix, size, resample=Image.LANCZOS):
+        """
+        Rasterize image_state (fully opaque) through render_matrix; see
+        core.rasterize. Where a working copy downscaled on load would be
+        magnified, the full-resolution source is sampled instead, so zooming
+        in still shows every pixel of the original photo.
+        """
+        if image_state.is_downscaled and render_matrix.scale_factor() > 1.0:
+            full_image = image_state.full_resolution_source()
+            if full_image is not image_state.image_original:
+                full_matrix = render_matrix @ image_state.source_to_working
+                return transform_source(full_image, full_matrix, size, resample, full_image.size,
+                                        full_matrix.scale_factor(), self.stage_timings)
+        return rasterize(image_state.mip_pyramid, image_state.image_original.size, render_matrix, size,
+                         resample, vector_cache=image_state.vector_cache if self.vector_render_enabled else None,
+                         timings=self.stage_timings)
+
+    def render_crop(self, image_state, layout, rect):
+        """The part rect = (x0, y0, x1, y1) of a layer's raster, rendered on its own."""
+        x0, y0, x1, y1 = rect
+        return self.render_image(image_state, Affine.translation(-x0, -y0) @ layout.render_matrix,
+                                 (x1 - x0, y1 - y0), layout.resample, layout.level)
+
+    @staticmethod
+    def viewport_crop(layout, viewport):
+        """Part (x0, y0, x1, y1) of a layer's raster inside the viewport."""
+        position = layout.position
+        # Positions can be fractional; clip on whole raster pixels.
+        return (max(0, math.floor(viewport[0] - position[0])), max(0, math.floor(viewport[1] - position[1])),
+                min(layout.size[0], math.ceil(viewport[2] - position[0])),
+                min(layout.size[1], math.ceil(viewport[3] - position[1])))
+
+    def viewport_raster(self, image_state, layout, viewport):
+        """
+        (key, image, canvas position) of the on-screen part of a layer. Rasters
+        much larger than the viewport are rendered only where they are on
+        screen; others come whole from the render cache.
+        """
+        if not should_tile(layout.size, viewport):
+            img, key = self.layer_raster(image_state, layout)
+            return key, img, layout.position
+        crop = self.viewport_crop(layout, viewport)
+        return (self.current_keys(layout, crop)[1], self.render_crop(image_state, layout, crop),
+                (layout.position[0] + crop[0], layout.position[1] + crop[1]))
+
+    ########################################################################
+    # Compositing
+    ########################################################################
+    def composite_layer(self, image_state, viewport):
+        """
+        (key, premultiplied array, canvas position) of a layer for the
+        compositor, or None when it is off-screen. Arrays are kept per layer
+        until the layer's render key changes.
+        """
+        layout = self.layout(image_state, viewport)
+        if layout is None:
+            return None
+        cached = self._composite_sources.get(image_state.name)
+        if should_tile(layout.size, viewport):
+            crop = self.viewport_crop(layout, viewport)
+            position = (layout.position[0] + crop[0], layout.position[1] + crop[1])
+            key = self.current_keys(layout, crop)[1]
+            if cached is None or cached[0] != key:
+                with image_state.render_lock:
+                    cached = (key, to_premultiplied(self.render_crop(image_state, layout, crop)))
+        else:
+            position = layout.position
+            if cached is None or cached[0] not in self.current_keys(layout):
+                img, key = self.render_detached(image_state, layout)
+                cached = (key, to_premultiplied(img))
+        self._composite_sources[image_state.name] = cached
+        return cached[0], cached[1], position
+
+    def compose_frame(self, images, active_name, viewport):
+        """
+        Blend the visible layers of images (bottom first) into the viewport
+        frame, keeping the layers below and above active_name as cached sums.
+        Returns what NumpyCompositor.compose_stack returns.
+        """
+        if self.compositor is None:
+            self.compositor = NumpyCompositor(viewport[2:])
+        self.compositor.resize(viewport[2:])
+
+        below, active, above = [], None, []
+        past_active = False
+        for image_name, image_state in images.items():
+            if not image_state.visible:
+                self._composite_sources.pop(image_name, None)
+                continue
+            layer = self.composite_layer(image_state, viewport)
+            if image_name == active_name:
+                active, past_active = layer, True
+            elif layer is not None:
+                (above if past_active else below).append(layer)
+        return self.compositor.compose_stack(below, active, above)
+
+    def composite_needs_settle(self):
+        """True if any layer in the composite was rendered with a filter other than settle_resample."""
+        return any(key[2] != self.settle_resample for key, _ in self._composite_sources.values())
+
+    def composite_image(self):
+        """The last composed frame as a straight-alpha RGBA image."""
+        return self.compositor.to_image()
+
+    def reset_composite(self):
+        """Drop cached composite inputs and sums; the next frame is composed from scratch."""
+        self._composite_sources.clear()
+        if self.compositor:
+            self.compositor.invalidate()
+
+    def render_scene(self, images, size):
+        """
+        Every visible layer of images, bottom first, composited into a new
+        RGBA image of size: the whole canvas, without a display. Uses NumPy
+        when it is available and PIL otherwise.
+        """
+        viewport = (0, 0) + tuple(size)
+        layers = []
+        for image_state in images.values():
+            if not image_state.visible:
+                continue
+            layout = self.layout(image_state, viewport)
+            if layout is not None:
+                _, img, position = self.viewport_raster(image_state, layout, viewport)
+                layers.append((img, position))
+
+        if numpy_available():
+            compositor = NumpyCompositor(size)
+            compositor.compose([(to_premultiplied(img), position) for img, position in layers])
+            return compositor.to_image()
+        frame = Image.new('RGBA', tuple(size), (0, 0, 0, 0))
+        for img, (x, y) in layers:
+            x, y = int(x), int(y)
+            # alpha_composite needs a non-negative destination; crop what hangs off the top/left.
+            crop = img.crop((max(0, -x), max(0, -y), img.width, img.height))
+            frame.alpha_composite(crop, dest=(max(0, x), max(0, y)))
+        return frame
+
+    ########################################################################
+    # Export
+    ########################################################################
+    def export_image(self, image_state):
+        """
+        The layer exactly as it is drawn, using the same matrix as the canvas.
+        Photos downscaled on load are rendered from the full-resolution file.
+        """
+        render_matrix, size, _ = image_state.get_raster_layout()
+        full_image = image_state.load_full_resolution()
+        if full_image is image_state.image_original:
+            with image_state.render_lock:
+                return self.render_image(image_state, render_matrix, size)
+        full_matrix = render_matrix @ image_state.source_to_working
+        img = transform_source(full_image, full_matrix, size, Image.LANCZOS,
+                               full_image.size, full_matrix.scale_factor(), self.stage_timings)
+        with stage(self.stage_timings, 'alpha'):
+            return apply_transparency(img, image_state.image_transparency_level)
+
+    def export_svg(self, image_state):
+        """
+        The layer's SVG document wrapped in a group carrying its canvas
+        transform and opacity, or None for raster layers.
+        """
+        svg_content = image_state.svg_content
+        if not svg_content:
+            return None
+        from lxml import etree
+        parser = etree.XMLParser(ns_clean=True, recover=True, encoding='utf-8')
+        svg_root = etree.fromstring(svg_content.encode('utf-8'), parser=parser)
+
+        # Same source-to-canvas matrix as the raster path, expressed in the
+        # document's user units rather than the pixels cairosvg rendered.
+        units_to_pixels = self.svg_units_to_pixels(svg_root, image_state.image_original.size)
+        matrix = units_to_pixels.inverse() @ image_state.get_matrix() @ units_to_pixels
+        g = etree.Element("g")
+        g.set("transform", matrix.to_svg())
+
+        for child in list(svg_root):
+            svg_root.remove(child)
+            g.append(child)
+
+        svg_root.append(g)
+        if image_state.image_transparency_level != 1.0:
+            g.set("opacity", str(image_state.image_transparency_level))
+
+        return etree.tostring(svg_root, encoding='utf-8', method='xml', pretty_print=True).decode('utf-8')
+
+    @staticmethod
+    def svg_units_to_pixels(svg_root, raster_size):
+        """Map SVG user units onto the raster rendered from the same document."""
+        view_box = svg_root.get('viewBox')
+        if not view_box:
+            return Affine.identity()
+        try:
+            vb_x, vb_y, vb_width, vb_height = [float(v) for v in view_box.replace(',', ' ').split()]
+        except ValueError:
+            return Affine.identity()
+        if vb_width <= 0 or vb_height <= 0:
+            return Affine.identity()
+        return (Affine.scaling(raster_size[0] / vb_width, raster_size[1] / vb_height)
+                @ Affine.translation(-vb_x, -vb_y))
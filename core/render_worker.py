@@ -0,0 +1,123 @@
+# core/render_worker.py
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_RENDER_WORKERS = 2
+
+
+class RenderWorker:
+    """
+    Runs layer renders on a thread pool so the Tk thread (and the pynput
+    callbacks queued behind it) never waits for PIL resampling, which
+    releases the GIL.
+
+    Jobs are submitted per key (a layer name) with a tag describing what they
+    render. Each key has at most one job running and one waiting; submitting
+    again replaces the waiting job, so transforms superseded before their
+    render started are never rendered. The running job's result is still
+    shown when it finishes, so a long drag updates at render speed instead
+    of waiting for input to pause. Results of jobs submitted before
+    cancel(key) are dropped.
+
+    on_done(result) runs on the Tk thread through widget.after. All
+    bookkeeping happens on the Tk thread; only the job function runs on the
+    pool. With a LatencyMonitor, each delivered job adds its run time
+    ('render_job') and the time from start to on_done returning
+    ('render_delivery').
+    """
+    def __init__(self, widget, max_workers=DEFAULT_RENDER_WORKERS, monitor=None):
+        self.widget = widget
+        self.monitor = monitor
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="RenderWorker")
+        self._generations = {}
+        self._cancelled = {}
+        self._running = {}
+        self._waiting = {}
+        self.submitted = 0
+        self.delivered = 0
+        self.superseded = 0
+        self.dropped = 0
+
+    def submit(self, key, tag, function, *args, on_done):
+        """
+        Queue function(*args) for key, replacing a job still waiting for the
+        same key. Must be called from the Tk thread.
+        """
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        job = (generation, tag, function, args, on_done)
+        self.submitted += 1
+        if key in self._running:
+            if key in self._waiting:
+                self.superseded += 1
+            self._waiting[key] = job
+        else:
+            self._start(key, job)
+
+    def pending_tag(self, key):
+        """Tag of the newest job for key not yet delivered, or None."""
+        job = self._waiting.get(key) or self._running.get(key)
+        if job is None or job[0] <= self._cancelled.get(key, 0):
+            return None
+        return job[1]
+
+    def cancel(self, key):
+        """Forget the waiting job for key and drop the result of the running one."""
+        self._cancelled[key] = self._generations.get(key, 0)
+        if self._waiting.pop(key, None):
+            self.superseded += 1
+
+    def cancel_all(self):
+        for key in list(self._generations):
+            self.cancel(key)
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        return (f"{self.submitted} render jobs: {self.delivered} delivered, "
+                f"{self.superseded} superseded, {self.dropped} dropped")
+
+    def _start(self, key, job):
+        self._running[key] = job
+        started = time.perf_counter()
+        future = self._executor.submit(self._run_timed, job[2], job[3])
+
+        def _finished(done_future):
+            try:
+                self.widget.after(0, self._deliver, key, job, done_future, started)
+            except Exception as e:
+                logging.debug(f"Dropping render result for '{key}': {e}")
+
+        future.add_done_callback(_finished)
+
+    @staticmethod
+    def _run_timed(function, args):
+        start = time.perf_counter()
+        result = function(*args)
+        return result, (time.perf_counter() - start) * 1000
+
+    def _deliver(self, key, job, future, started):
+        if self._running.get(key) is job:
+            del self._running[key]
+        waiting = self._waiting.pop(key, None)
+        if waiting:
+            self._start(key, waiting)
+
+        generation, _, _, _, on_done = job
+        if generation <= self._cancelled.get(key, 0):
+            self.dropped += 1
+            return
+        try:
+            result, job_ms = future.result()
+        except Exception as e:
+            logging.error(f"Error rendering '{key}': {e}")
+            self.dropped += 1
+            return
+        self.delivered += 1
+        on_done(result)
+        if self.monitor and self.monitor.enabled:
+            self.monitor.add('render_job', job_ms)
+            self.monitor.add('render_delivery', (time.perf_counter() - started) * 1000)
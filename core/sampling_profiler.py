@@ -0,0 +1,106 @@
+# core/sampling_profiler.py
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler covering every thread in the process.
+
+    A daemon thread wakes every interval seconds, reads sys._current_frames()
+    and counts each thread's stack. Unlike cProfile it sees all threads (Tk,
+    the pynput listeners, loader and render workers) and costs nothing
+    between samples, so it can be left running on a clinic machine until a
+    stall happens. Results are written as collapsed stacks, one
+    "thread;outermost;...;innermost count" line per stack, the input format
+    of flamegraph.pl and speedscope.
+    """
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._stacks = Counter()
+        self._labels = {}
+        self._thread_names = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """Clear previous samples and start sampling. Safe from any thread."""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._stacks.clear()
+            self.samples = 0
+            self.started_at = time.perf_counter()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread. Safe from any thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return False
+            self._stop.set()
+            thread.join()
+            self.duration = time.perf_counter() - self.started_at
+            return True
+
+    def write_collapsed(self, path):
+        """Write the collapsed stacks, most frequent first."""
+        with open(path, 'w', encoding='utf-8') as collapsed_file:
+            for stack, count in self._stacks.most_common():
+                collapsed_file.write(f"{';'.join(stack)} {count}\n")
+        return path
+
+    def top_functions(self, count=10):
+        """[(function, share of samples)] of the functions most often on top of a stack."""
+        totals = Counter()
+        for stack, samples in self._stacks.items():
+            totals[stack[-1]] += samples
+        total = sum(totals.values()) or 1
+        return [(function, samples / total) for function, samples in totals.most_common(count)]
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(self._thread_name(ident))
+                stack.reverse()
+                self._stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+        return label
+
+    def _thread_name(self, ident):
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
@@ -0,0 +1,72 @@
+# core/svg_raster.py
+import io
+import math
+import logging
+from collections import OrderedDict
+
+from PIL import Image
+
+from core.render_cache import image_nbytes
+
+DEFAULT_VECTOR_BUCKETS = 4
+BUCKETS_PER_OCTAVE = 4
+MAX_VECTOR_PIXELS = 32 * 1024 * 1024
+
+
+def rasterize_svg(svg_content, scale=1.0):
+    """Render SVG markup to an RGBA image at the given scale."""
+    # Imported here so raster-only layers (and headless tools) don't need Cairo.
+    import cairosvg
+    png_data = cairosvg.svg2png(bytestring=svg_content.encode('utf-8'), scale=scale)
+    return Image.open(io.BytesIO(png_data)).convert("RGBA")
+
+
+class VectorRasterCache:
+    """
+    Re-rasterizes an SVG directly at a target scale instead of resampling its
+    native-size bitmap. Scales are snapped up to quarter-octave buckets and the
+    most recently used buckets are kept, so returning to a zoom level is free.
+    """
+    def __init__(self, svg_content, base_size, max_entries=DEFAULT_VECTOR_BUCKETS):
+        self.svg_content = svg_content
+        self.base_size = base_size
+        self.max_entries = max_entries
+        # Kept as a running total, like MipPyramid's, so the memory manager can
+        # read it on the Tk thread while a render worker fills the cache.
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+
+    def bucket_for_scale(self, scale):
+        return 2 ** (math.ceil(math.log2(scale) * BUCKETS_PER_OCTAVE) / BUCKETS_PER_OCTAVE)
+
+    def get(self, scale):
+        """
+        Return (image, (factor_x, factor_y)) rasterized at the bucket covering
+        scale, or None when that raster would be too large or rendering fails.
+        """
+        bucket = self.bucket_for_scale(scale)
+        image = self._entries.get(bucket)
+        if image is None:
+            width, height = self.base_size
+            if width * height * bucket * bucket > MAX_VECTOR_PIXELS:
+                return None
+            try:
+                image = rasterize_svg(self.svg_content, bucket)
+            except Exception as e:
+                logging.error(f"Error rasterizing SVG at scale {bucket:.3f}: {e}")
+                return None
+            self._entries[bucket] = image
+            self.current_bytes += image_nbytes(image)
+            while len(self._entries) > self.max_entries:
+                self.current_bytes -= image_nbytes(self._entries.popitem(last=False)[1])
+            logging.debug(f"Rasterized SVG at scale bucket {bucket:.3f} ({image.width}x{image.height}).")
+        else:
+            self._entries.move_to_end(bucket)
+        return image, (image.width / self.base_size[0], image.height / self.base_size[1])
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,91 @@
+# core/template_preloader.py
+import logging
+import threading
+
+
+class TemplatePreloader:
+    """
+    Decodes predefined templates on a background thread so that the first
+    toggle of a template only has to swap in a ready ImageState.
+
+    load_function(key, path) runs on the worker thread and returns the decoded
+    object (or None). on_progress(done, total) is called from the worker after
+    each item; it must hand off to the Tk thread itself.
+    """
+    def __init__(self, load_function, on_progress=None):
+        self.load_function = load_function
+        self.on_progress = on_progress
+        self.total = 0
+        self.done = 0
+        self.cancelled = False
+        self._queue = []
+        self._results = {}
+        self._current = None
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def start(self, items):
+        """items: list of (key, path) pairs, decoded in order."""
+        with self._condition:
+            self._queue = list(items)
+            self.total = len(self._queue)
+        self._thread = threading.Thread(target=self._run, name="TemplatePreloader", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop after the item in progress and drop everything decoded so far."""
+        with self._condition:
+            self.cancelled = True
+            self._queue.clear()
+            self._results.clear()
+            self._condition.notify_all()
+
+    @property
+    def finished(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def take(self, key):
+        """
+        Hand over a preloaded item. Waits if the worker is decoding key right now;
+        returns None if it was not preloaded (the key is then skipped by the worker,
+        since the caller is about to load it itself).
+        """
+        with self._condition:
+            while self._current == key and not self.cancelled:
+                self._condition.wait()
+            if key in self._results:
+                return self._results.pop(key)
+            remaining = [(k, path) for k, path in self._queue if k != key]
+            self.total -= len(self._queue) - len(remaining)
+            self._queue = remaining
+            return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self.cancelled or not self._queue:
+                    self._current = None
+                    self._condition.notify_all()
+                    break
+                key, path = self._queue.pop(0)
+                self._current = key
+
+            try:
+                result = self.load_function(key, path)
+            except Exception as e:
+                logging.error(f"Error preloading template '{key}': {e}")
+                result = None
+
+            with self._condition:
+                self._current = None
+                if result is not None and not self.cancelled:
+                    self._results[key] = result
+                self.done += 1
+                self._condition.notify_all()
+                cancelled = self.cancelled
+
+            if self.on_progress and not cancelled:
+                self.on_progress(self.done, self.total)
+
+        logging.info(f"Template preloading {'cancelled' if self.cancelled else 'finished'} "
+                     f"({self.done}/{self.total}).")
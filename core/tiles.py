@@ -0,0 +1,36 @@
+# core/tiles.py
+import math
+
+DEFAULT_TILE_SIZE = 512
+DEFAULT_TILE_CACHE_BYTES = 32 * 1024 * 1024
+# Rasters covering more than this many viewports are drawn as tiles.
+TILED_VIEWPORT_RATIO = 2.0
+
+
+def should_tile(raster_size, viewport, ratio=TILED_VIEWPORT_RATIO):
+    """True if a layer raster is large enough, relative to the viewport, to be tiled."""
+    viewport_area = max(1, (viewport[2] - viewport[0]) * (viewport[3] - viewport[1]))
+    return raster_size[0] * raster_size[1] > ratio * viewport_area
+
+
+def tile_rect(col, row, raster_size, tile_size=DEFAULT_TILE_SIZE):
+    """Rectangle (x0, y0, x1, y1) of a tile in raster pixels, clipped to the raster."""
+    x0, y0 = col * tile_size, row * tile_size
+    return (x0, y0, min(x0 + tile_size, raster_size[0]), min(y0 + tile_size, raster_size[1]))
+
+
+def visible_tiles(raster_size, position, viewport, tile_size=DEFAULT_TILE_SIZE):
+    """
+    (col, row) of every tile of a raster drawn at canvas position that meets
+    the viewport. Tiles are anchored to the raster origin, so a tile keeps
+    its content while the layer is only translated.
+    """
+    x0 = max(viewport[0] - position[0], 0)
+    y0 = max(viewport[1] - position[1], 0)
+    x1 = min(viewport[2] - position[0], raster_size[0])
+    y1 = min(viewport[3] - position[1], raster_size[1])
+    if x0 >= x1 or y0 >= y1:
+        return []
+    cols = range(int(x0 // tile_size), math.ceil(x1 / tile_size))
+    rows = range(int(y0 // tile_size), math.ceil(y1 / tile_size))
+    return [(col, row) for row in rows for col in cols]
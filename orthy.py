@@ -5,11 +5,10 @@ import os
 import threading
 import tkinter as tk
 from tkinter import filedialog, colorchooser, simpledialog, messagebox, font as tkfont
-from PIL import Image, ImageTk, ImageFont, ImageDraw
+from PIL import Image, ImageFont, ImageDraw
 import cairosvg
 from pynput import keyboard, mouse
 import logging
-from lxml import etree
 import datetime
 import ctypes
 import importlib
@@ -19,6 +18,22 @@ from logging import Handler
    
 from core.OrthyPlugin_Interface import OrthyPlugin
 from core.plugin_loader import PluginLoader
+from core.render_cache import DEFAULT_RENDER_CACHE_BYTES
+from core.frame_scheduler import FrameScheduler, DEFAULT_MAX_FPS
+from core.mipmap import DEFAULT_MIP_CACHE_BYTES
+from core.raster_disk_cache import RasterDiskCache, DEFAULT_DISK_CACHE_BYTES
+from core.template_preloader import TemplatePreloader
+from core.image_loader import AsyncImageLoader
+from core.photo_pool import PhotoImagePool
+from core.compositor import numpy_available
+from core.image_memory import ImageMemoryManager, DEFAULT_IMAGE_MEMORY_BYTES
+from core.tiles import should_tile, DEFAULT_TILE_CACHE_BYTES
+from core.image_state import ImageState
+from core.render_engine import RenderEngine
+from core.render_worker import RenderWorker
+from core.rasterize import stage
+from core.latency import LatencyMonitor
+from core.sampling_profiler import SamplingProfiler
 
 # Configure logging to write to log.txt and optionally to console
 logging.basicConfig( 
@@ -47,24 +62,6 @@ def get_base_dir():
     else:
         return os.path.dirname(os.path.abspath(__file__))
 
-class ImageState:
-    """Holds an image, its transformations, and its visibility state."""
-    def __init__(self, image_original, name, svg_content=None):
-        self.image_original = image_original
-        self.image_display = None
-        self.name = name
-        self.visible = True
-        self.angle = 0
-        self.scale = 1.0
-        self.scale_log = 0
-        self.offset_x = 512
-        self.offset_y = 512
-        self.rotation_point = None
-        self.is_flipped_horizontally = False
-        self.is_flipped_vertically = False
-        self.image_transparency_level = 0.2
-        self.svg_content = svg_content
-
 class TextHandler(Handler):
     """A logging handler that writes log messages to a Tkinter Text widget."""
     def __init__(self, text_widget):
@@ -96,6 +93,11 @@ class Orthy:
         # Basic paths & geometry
         self.base_dir = get_base_dir()
         self.images_dir = os.path.join(self.base_dir, 'Images', 'ArchSaves')
+        self.raster_disk_cache = RasterDiskCache(
+            os.path.join(self.base_dir, 'cache', 'svg'),
+            max_bytes=DEFAULT_DISK_CACHE_BYTES,
+            salt=getattr(cairosvg, '__version__', '')
+        )
         self.set_root_window_geometry()
 
         # Internal state
@@ -104,6 +106,32 @@ class Orthy:
         self.previous_active_image_name = None
         self.is_dragging = False
         self.is_rotation_point_mode = False
+        self.render_cache_bytes = DEFAULT_RENDER_CACHE_BYTES
+        self.mip_cache_bytes = DEFAULT_MIP_CACHE_BYTES
+        self.tile_cache_bytes = DEFAULT_TILE_CACHE_BYTES
+        self.memory_manager = ImageMemoryManager(DEFAULT_IMAGE_MEMORY_BYTES)
+        # Rasterizing, compositing and export; Orthy only puts the results on the canvas
+        self.render_engine = RenderEngine(self.memory_manager)
+        # 'layers': one canvas image per layer; 'composite': one NumPy-blended frame
+        self.render_mode = 'layers'
+        self.canvas = None
+        self.frame_scheduler = FrameScheduler(self.root, self.render_frame, max_fps=DEFAULT_MAX_FPS)
+        # Input-to-pixels timing, recorded while the latency HUD is on
+        self.latency = LatencyMonitor()
+        self.hud_interval_ms = 250
+        self.hud_after_id = None
+        # Whole-process stack sampler, toggled with <ctrl>+<space>+6
+        self.profiler = SamplingProfiler()
+        self.photo_pool = PhotoImagePool()
+
+        # Render quality (see RenderEngine): settle to full quality once input is idle
+        self.settle_delay_ms = 200
+        self.per_pixel_hit_test = False
+        self.settle_after_id = None
+
+        # Image window <Configure> debouncing
+        self.resize_debounce_ms = 100
+        self.resize_after_id = None
 
         self.image_window_visible = False
         self.space_pressed = False
@@ -130,6 +158,32 @@ class Orthy:
             "Narrow Ovoide": False,
             "Angulation": False
         }
+        self.predefined_image_files = {
+            "Ruler": 'liniar_new_n2.svg',
+            "Normal": 'Normal(medium).svg',
+            "Tapered": 'Tapered.svg',
+            "Ovoide": 'Ovoide.svg',
+            "Narrow Tapered": 'NarrowTapered.svg',
+            "Narrow Ovoide": 'NarrowOvoide.svg',
+            "Angulation": 'angulation.svg'
+        }
+        self.template_preloader = None
+
+        # Background decoding of user-selected images
+        self.image_loader = AsyncImageLoader(self.root)
+        # Layer rasters are rendered off the Tk thread; None renders them synchronously
+        self.render_worker = RenderWorker(self.root, monitor=self.latency)
+        self.pending_loads = {}
+        self.loading_placeholder_id = None
+        # Raster images are kept as a working copy no larger than the screen
+        # times load_zoom_headroom. Where that copy would be magnified (a
+        # 6000x4000 photo on a 1080p screen already is at zoom 1.0), the
+        # render engine samples the full-resolution file instead, decoded on
+        # first use and released with the layer's other caches.
+        self.load_zoom_headroom = 2.0
+        self.max_load_dimension = int(
+            max(self.root.winfo_screenwidth(), self.root.winfo_screenheight()) * self.load_zoom_headroom
+        )
 
         # Build UI
         self.setup_UI()
@@ -148,6 +202,9 @@ class Orthy:
         # Hotkeys
         self.setup_global_hotkeys()
 
+        # Decode predefined templates in the background once the UI is up
+        self.root.after_idle(self.start_template_preload)
+
     def set_root_window_geometry(self):
         """Position the main control window on the right side of the screen."""
         window_width = 110
@@ -254,6 +311,50 @@ class Orthy:
         self.create_rotation_point_control(parent,row_index+3)
         self.create_zoom_controls(parent,row_index+4)
         self.create_predefined_image_btn_configs(parent,row_index+5)
+        self.create_preload_status(parent, row_index+14)
+        self.create_render_mode_button(parent, row_index+15)
+        self.create_latency_button(parent, row_index+16)
+        self.create_load_status(parent, row_index+17)
+
+    def create_preload_status(self, parent, row_index):
+        """Small label showing progress of the background template preloader."""
+        self.lbl_preload_status = tk.Label(parent, text="Templates: off", font=self.small_font)
+        self.lbl_preload_status.grid(row=row_index, column=0, columnspan=2, pady=2, sticky='ew')
+
+    def create_load_status(self, parent, row_index):
+        """
+        Label listing the images still decoding. The image window only opens
+        once a first image has loaded, so the canvas placeholder alone is not
+        visible during the first (slowest) load.
+        """
+        self.lbl_load_status = tk.Label(parent, text="", font=self.small_font)
+        self.lbl_load_status.grid(row=row_index, column=0, columnspan=2, pady=2, sticky='ew')
+        self.lbl_load_status.grid_remove()
+        self.update_loading_placeholder()
+
+    def create_render_mode_button(self, parent, row_index):
+        """Switch between per-layer canvas images and one composited frame."""
+        config = {
+            'text': self.render_mode_button_text(),
+            'command': self.toggle_render_mode,
+            'grid': {'row': row_index, 'column': 0, 'columnspan': 2, 'pady': 2, 'sticky': 'ew'},
+            'width': 15,
+            'variableName': 'btn_render_mode'
+        }
+        button = self.create_button(parent, config)
+        if not numpy_available():
+            button.config(state='disabled')
+
+    def create_latency_button(self, parent, row_index):
+        """Show frame and input latency on the image canvas; turning it off saves a report."""
+        config = {
+            'text': self.latency_button_text(),
+            'command': self.toggle_latency_hud,
+            'grid': {'row': row_index, 'column': 0, 'columnspan': 2, 'pady': 2, 'sticky': 'ew'},
+            'width': 15,
+            'variableName': 'btn_latency_hud'
+        }
+        self.create_button(parent, config)
 
     def create_transparency_button(self, parent,row_index):
         config = {
@@ -398,6 +499,12 @@ class Orthy:
             highlightthickness=0, borderwidth=0
         )
         self.canvas.pack(fill='both', expand=True)
+        self.image_window_size = None
+        self.pending_window_size = None
+        self.composite_item_id = None
+        self.composite_photo = None
+        self.hud_item_id = None
+        self.render_engine.reset_composite()
         self.image_window.update_idletasks()
 
         self.bind_canvas_events()
@@ -452,6 +559,12 @@ class Orthy:
             logging.info("Global hotkey: <space>+j pressed. Toggling Ruler.")
             self.root.after(0, self.toggle_ruler)
 
+        def toggle_profiler_hotkey():
+            logging.info("Global hotkey: Ctrl+Space+6 pressed. Toggling profiler.")
+            # Called on the listener thread, not through after(): the profiler
+            # has to start and stop even while the Tk thread is stalled.
+            self.toggle_profiler()
+
         try:
             self.global_hotkey_listener = keyboard.GlobalHotKeys({
                 # home key when pressed we toggle maestro controls
@@ -466,6 +579,7 @@ class Orthy:
                 '<space>+.': toggle_image_window_hotkey,
                 '<space>+/': toggle_image_control_hotkey,
                 '<ctrl>+<space>+5': reset_all,
+                '<ctrl>+<space>+6': toggle_profiler_hotkey,
             })
             self.global_hotkey_listener.start()
             logging.info("Global Hotkeys listener started successfully.")
@@ -476,9 +590,37 @@ class Orthy:
     ########################################################################
     # Event Handlers - Canvas
     ########################################################################
-    def on_image_window_resize(self, event)     :
-        self.canvas.config(width=event.width, height=event.height)
-        self.draw_images()
+    def on_image_window_resize(self, event):
+        """
+        Debounce <Configure>: children's events and unchanged sizes are ignored,
+        and a burst of resizes is applied once, resize_debounce_ms after the last.
+        """
+        if event.widget is not self.image_window:
+            return
+        size = (event.width, event.height)
+        if size == self.image_window_size:
+            if self.resize_after_id is not None:
+                self.root.after_cancel(self.resize_after_id)
+                self.resize_after_id = None
+            return
+        self.pending_window_size = size
+        if self.resize_after_id is not None:
+            self.root.after_cancel(self.resize_after_id)
+        self.resize_after_id = self.root.after(self.resize_debounce_ms, self.apply_image_window_resize)
+
+    def apply_image_window_resize(self):
+        self.resize_after_id = None
+        if self.canvas is None or self.pending_window_size == self.image_window_size:
+            return
+        self.image_window_size = self.pending_window_size
+        width, height = self.image_window_size
+        self.canvas.config(width=width, height=height)
+        logging.debug(f"Image window resized to {width}x{height}.")
+        # Only the viewport changed: re-place and re-cull the cached layers.
+        # Layers that come back on screen are rasterized; the rest are not.
+        for image_name, image_state in self.images.items():
+            if image_state.visible:
+                self.request_redraw(image_name, content=False)
 
     def on_mouse_down(self, event):
         if not self.is_rotation_point_mode:
@@ -494,49 +636,33 @@ class Orthy:
     def on_mouse_move(self, event):
         active_image = self.get_active_image()
         if self.is_dragging and active_image:
+            self.latency.record_input('mouse')
+            self.note_interaction()
             dx = event.x_root - self.start_x
             dy = event.y_root - self.start_y
             if event.state & 0x0004:  # Middle mouse drag?
                 active_image.angle += dx * 0.1
                 active_image.angle %= 360
                 logging.debug(f"Rotating image '{active_image.name}' by {dx * 0.1} degrees.")
+                self.request_redraw(active_image.name)
             else:
-                active_image.offset_x += dx
-                active_image.offset_y += dy
+                self.translate_image(active_image, dx, dy)
                 logging.debug(f"Moving image '{active_image.name}' by ({dx}, {dy}).")
             self.start_x = event.x_root
             self.start_y = event.y_root
-            self.draw_images()
 
     def on_canvas_click(self, event):
         active_image = self.get_active_image()
         if active_image and self.is_rotation_point_mode:
-            active_image.rotation_point = (event.x, event.y)
+            active_image.set_rotation_point((event.x, event.y))
             self.is_rotation_point_mode = False
             if hasattr(self, 'btn_rotation_point'):
                 self.btn_rotation_point.config(text="Rot Pt")
-            self.draw_images()
+            self.request_redraw(active_image.name)
             logging.info(f"Rotation point set for image '{active_image.name}' at ({event.x}, {event.y}).")
         elif active_image:
             # Check if clicked outside the active image
-            img = active_image.image_original.copy()
-            img = img.resize(
-                (int(img.width * active_image.scale), int(img.height * active_image.scale)),
-                Image.LANCZOS
-            )
-
-            if active_image.is_flipped_horizontally:
-                img = img.transpose(Image.FLIP_LEFT_RIGHT)
-            if active_image.is_flipped_vertically:
-                img = img.transpose(Image.FLIP_TOP_BOTTOM)
-
-            img_width, img_height = img.size
-            x_min = active_image.offset_x - img_width / 2
-            y_min = active_image.offset_y - img_height / 2
-            x_max = active_image.offset_x + img_width / 2
-            y_max = active_image.offset_y + img_height / 2
-
-            if not (x_min <= event.x <= x_max and y_min <= event.y <= y_max):
+            if not active_image.contains_point(event.x, event.y, per_pixel=self.per_pixel_hit_test):
                 ic_plugin = self.plugin_loader.get_plugin("ImageControl")
                 if ic_plugin:
                     ic_plugin.toggle_image_control(False)
@@ -547,13 +673,15 @@ class Orthy:
         active_image = self.get_active_image()
         if not active_image:
             return
+        self.latency.record_input('wheel')
+        self.note_interaction()
         delta = self.get_mouse_wheel_delta(event)
         active_image.scale_log += delta * 0.05
         active_image.scale = pow(2, active_image.scale_log)
         active_image.scale = max(0.1, min(active_image.scale, 10.0))
         active_image.scale_log = math.log2(active_image.scale)
         logging.debug(f"Zooming image '{active_image.name}' to scale {active_image.scale}.")
-        self.draw_images()
+        self.request_redraw(active_image.name)
 
     def get_mouse_wheel_delta(self, event):
         if sys.platform.startswith('win') or sys.platform == 'darwin':
@@ -587,7 +715,7 @@ class Orthy:
         if hasattr(self, 'btn_rotation_point'):
             self.btn_rotation_point.config(text="Rot Pt")
 
-        self.draw_images()
+        self.request_redraw(active_image.name)
         logging.info(f"Reset transformations for image '{active_image.name}'.")
 
     ########################################################################
@@ -608,7 +736,95 @@ class Orthy:
             if hasattr(self, 'btn_toggle_transparency'):
                 self.btn_toggle_transparency.config(text="Min Transp")
             logging.info(f"Transparency of image '{active_image.name}' set to maximum.")
-        self.draw_images()
+        self.request_redraw(active_image.name)
+
+    def toggle_render_mode(self):
+        self.set_render_mode('layers' if self.render_mode == 'composite' else 'composite')
+        if hasattr(self, 'btn_render_mode'):
+            self.btn_render_mode.config(text=self.render_mode_button_text())
+
+    def render_mode_button_text(self):
+        # The mode a click switches to; the mode survives reset_all, which rebuilds the button.
+        return "Layers" if self.render_mode == 'composite' else "Single Frame"
+
+    def toggle_latency_hud(self):
+        """
+        Start recording input-to-pixels latency and show it on the canvas, or
+        stop, hide the HUD and write the histograms to a file.
+        """
+        if self.latency.enabled:
+            self.latency.enabled = False
+            if self.hud_after_id is not None:
+                self.root.after_cancel(self.hud_after_id)
+                self.hud_after_id = None
+            if self.canvas is not None and self.hud_item_id is not None:
+                self.canvas.delete(self.hud_item_id)
+                self.hud_item_id = None
+            self.dump_latency()
+        else:
+            self.latency.reset()
+            self.latency.enabled = True
+            self.update_latency_hud()
+            logging.info("Latency monitoring started.")
+        if hasattr(self, 'btn_latency_hud'):
+            self.btn_latency_hud.config(text=self.latency_button_text())
+
+    def latency_button_text(self):
+        # Recording survives reset_all, which rebuilds the button.
+        return "Save Latency" if self.latency.enabled else "Latency HUD"
+
+    def update_latency_hud(self):
+        """Refresh the HUD text every hud_interval_ms; it is not part of any frame."""
+        self.hud_after_id = self.root.after(self.hud_interval_ms, self.update_latency_hud)
+        if self.canvas is None:
+            return
+        text = "\n".join(self.latency.report_lines())
+        if self.hud_item_id is None:
+            self.hud_item_id = self.canvas.create_text(
+                10, 10, text=text, anchor='nw', fill='yellow', font=('Courier', 9)
+            )
+        else:
+            self.canvas.itemconfigure(self.hud_item_id, text=text)
+        self.canvas.tag_raise(self.hud_item_id)
+
+    def dump_latency(self):
+        """Write the latency histograms next to the application as latency_<timestamp>.json."""
+        if not self.latency.histograms:
+            logging.info("No latency samples recorded.")
+            return None
+        path = os.path.join(self.base_dir, f"latency_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+        try:
+            self.latency.dump(path)
+        except OSError as e:
+            logging.error(f"Failed to write latency report: {e}")
+            return None
+        for line in self.latency.report_lines():
+            logging.info(line)
+        logging.info(f"Latency report written to {path}.")
+        return path
+
+    def toggle_profiler(self):
+        """
+        Start sampling every thread, or stop and write the samples next to the
+        application as profile_<timestamp>.collapsed. Safe from any thread.
+        """
+        if self.profiler.start():
+            logging.info(f"Profiler started ({self.profiler.interval * 1000:.0f} ms sampling).")
+        elif self.profiler.stop():
+            self.save_profile()
+
+    def save_profile(self):
+        path = os.path.join(self.base_dir, f"profile_{datetime.datetime.now():%Y%m%d_%H%M%S}.collapsed")
+        try:
+            self.profiler.write_collapsed(path)
+        except OSError as e:
+            logging.error(f"Failed to write profile: {e}")
+            return None
+        logging.info(f"Profiler stopped: {self.profiler.samples} samples over "
+                     f"{self.profiler.duration:.1f} s written to {path}.")
+        for function, share in self.profiler.top_functions(5):
+            logging.info(f"  {share:6.1%}  {function}")
+        return path
 
     def update_transparency_button_text(self):
         active_image = self.get_active_image()
@@ -629,45 +845,198 @@ class Orthy:
             filetypes=[("Image Files", "*.jpg;*.jpeg;*.png;*.bmp;*.svg")]
         )
         if filepath:
-            image_original, svg_content = self.open_image_file(filepath)
-            if image_original:
-                image_state = ImageState(image_original, image_name, svg_content=svg_content)
-                self.images[image_name] = image_state
-                self.active_image_name = image_name
-                self.draw_images()
-                logging.info(f"Image '{image_name}' loaded from '{filepath}'.")
-                if not self.image_window_visible:
-                    self.toggle_image_window()
-
-    def open_image_file(self, filepath):
+            self.load_image_async(filepath, image_name, self.on_image_loaded)
+
+    def log_image_memory(self):
+        """Log the resident image bytes of every layer, and the total."""
+        total = 0
+        for image_name, image_state in self.images.items():
+            usage = image_state.resident_bytes()
+            total += usage['total']
+            details = ", ".join(f"{part} {nbytes / 2**20:.1f} MB" for part, nbytes in usage.items() if part != 'total')
+            logging.info(f"Image '{image_name}' holds {usage['total'] / 2**20:.1f} MB ({details}).")
+        releasable = self.memory_manager.releasable_bytes(self.images)
+        logging.info(f"Images hold {total / 2**20:.1f} MB in total, {releasable / 2**20:.1f} MB of it "
+                     f"releasable caches (budget {self.memory_manager.max_bytes / 2**20:.0f} MB, "
+                     f"{self.memory_manager.evictions} cache evictions).")
+
+    def on_image_loaded(self, image_name, filepath, image_state):
+        self.images[image_name] = image_state
+        self.active_image_name = image_name
+        self.request_redraw()
+        logging.info(f"Image '{image_name}' loaded from '{filepath}' "
+                     f"({image_state.resident_bytes()['total'] / 2**20:.1f} MB resident).")
+        if not self.image_window_visible:
+            self.toggle_image_window()
+
+    def load_image_async(self, filepath, image_name, on_loaded):
+        """
+        Decode filepath on the loader pool and call on_loaded(image_name, filepath,
+        image_state) on the Tk thread. Pending loads are listed meanwhile (see
+        update_loading_placeholder). Returns the Future, or None if too many
+        loads are already queued.
+        """
+        future = self.image_loader.submit(
+            self.decode_image_state, image_name, filepath,
+            on_done=lambda done: self.finish_async_load(done, filepath, image_name, on_loaded)
+        )
+        if future is None:
+            messagebox.showwarning("Busy", "Too many images are loading. Please wait and try again.")
+            return None
+        self.pending_loads[future] = image_name
+        self.update_loading_placeholder()
+        logging.info(f"Loading '{filepath}' as '{image_name}' in the background...")
+        return future
+
+    def finish_async_load(self, future, filepath, image_name, on_loaded):
+        if self.pending_loads.pop(future, None) is None:
+            return  # Dropped by reset_all
+        self.update_loading_placeholder()
+        if future.cancelled():
+            return
+        try:
+            image_state = future.result()
+        except Exception as e:
+            logging.error(f"Error loading image '{filepath}': {e}")
+            image_state = None
+        if image_state is None:
+            messagebox.showerror("Load Failed", f"Failed to load '{os.path.basename(filepath)}'.")
+            return
+        on_loaded(image_name, filepath, image_state)
+
+    def update_loading_placeholder(self):
+        """
+        Show which images are still decoding, in the control window and in
+        the middle of the canvas.
+        """
+        text = f"Loading {', '.join(self.pending_loads.values())}..." if self.pending_loads else ""
+        if hasattr(self, 'lbl_load_status'):
+            self.lbl_load_status.config(text=text)
+            if text:
+                self.lbl_load_status.grid()
+            else:
+                self.lbl_load_status.grid_remove()
+        if self.canvas is None:
+            return
+        if not text:
+            if self.loading_placeholder_id is not None:
+                self.canvas.delete(self.loading_placeholder_id)
+                self.loading_placeholder_id = None
+            return
+        if self.loading_placeholder_id is None:
+            self.loading_placeholder_id = self.canvas.create_text(
+                self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2,
+                text=text, fill='white', font=self.small_font
+            )
+        else:
+            self.canvas.itemconfigure(self.loading_placeholder_id, text=text)
+
+    def open_image_file(self, filepath, max_dimension=None):
+        """
+        Decode filepath to RGBA, returning (image, svg_content, source_size).
+        Raster images larger than max_dimension on either side are decoded to a
+        downscaled working copy; source_size is always the full-resolution size.
+        Safe to call from worker threads.
+        """
         try:
             if filepath.lower().endswith('.svg'):
                 with open(filepath, 'r', encoding='utf-8') as svg_file:
                     svg_content = svg_file.read()
-                png_data = cairosvg.svg2png(url=filepath)
-                image_original = Image.open(io.BytesIO(png_data)).convert("RGBA")
-                return image_original, svg_content
+                # Rasters are cached on disk by content hash, so unchanged
+                # templates skip cairosvg entirely after the first run.
+                cache_key = self.raster_disk_cache.make_key(svg_content)
+                image_original = self.raster_disk_cache.load(cache_key)
+                if image_original is None:
+                    png_data = cairosvg.svg2png(url=filepath)
+                    image_original = Image.open(io.BytesIO(png_data)).convert("RGBA")
+                    self.raster_disk_cache.store(cache_key, image_original, source_path=filepath)
+                else:
+                    logging.debug(f"Loaded '{filepath}' from the raster cache.")
+                return image_original, svg_content, image_original.size
             else:
-                image_original = Image.open(filepath).convert("RGBA")
-                return image_original, None
+                image_file = Image.open(filepath)
+                source_size = image_file.size
+                if max_dimension and max(source_size) > max_dimension:
+                    ratio = max_dimension / max(source_size)
+                    # JPEGs decode straight to the nearest larger 1/2, 1/4 or 1/8 scale.
+                    image_file.draft('RGB', (int(source_size[0] * ratio), int(source_size[1] * ratio)))
+                image_original = image_file.convert("RGBA")
+                if max_dimension:
+                    image_original.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+                if image_original.size != source_size:
+                    logging.info(f"'{filepath}' downscaled on load from {source_size[0]}x{source_size[1]} "
+                                 f"to {image_original.width}x{image_original.height}.")
+                return image_original, None, source_size
         except Exception as e:
             logging.error(f"Error loading image: {e}")
-            return None, None
+            return None, None, None
 
     def load_default_image(self, image_key, filename):
-        filepath = resource_path(os.path.join('Images', filename))
-        if os.path.exists(filepath):
-            image_original, svg_content = self.open_image_file(filepath)
-            if image_original:
-                image_state = ImageState(image_original, image_key, svg_content=svg_content)
-                self.images[image_key] = image_state
-                self.center_image(image_key)
-                self.draw_images()
-                logging.info(f"Default '{image_key}' image loaded.")
-                if not self.image_window_visible:
-                    self.toggle_image_window()
+        # Templates decoded by the preloader only need to be swapped in.
+        image_state = self.template_preloader.take(image_key) if self.template_preloader else None
+        if image_state is None:
+            filepath = resource_path(os.path.join('Images', filename))
+            if not os.path.exists(filepath):
+                logging.error(f"'{filename}' not found at {filepath}")
+                return
+            image_state = self.decode_image_state(image_key, filepath)
+            if image_state is None:
+                return
+        self.images[image_key] = image_state
+        self.center_image(image_key)
+        self.request_redraw()
+        logging.info(f"Default '{image_key}' image loaded.")
+        if not self.image_window_visible:
+            self.toggle_image_window()
+
+    def decode_image_state(self, image_name, filepath):
+        """Decode filepath into a new ImageState. Runs on the loader and preloader threads."""
+        image_original, svg_content, source_size = self.open_image_file(
+            filepath, max_dimension=self.max_load_dimension
+        )
+        if not image_original:
+            return None
+        return ImageState(image_original, image_name, svg_content=svg_content,
+                          source_path=filepath, source_size=source_size,
+                          render_cache_bytes=self.render_cache_bytes,
+                          mip_cache_bytes=self.mip_cache_bytes,
+                          tile_cache_bytes=self.tile_cache_bytes)
+
+    def start_template_preload(self):
+        """Decode every predefined template on a worker thread once the UI is idle."""
+        if self.template_preloader:
+            self.template_preloader.cancel()
+        items = []
+        for image_key in self.additional_images_visibility:
+            if image_key in self.images:
+                continue
+            filepath = resource_path(os.path.join('Images', self.predefined_image_files[image_key]))
+            if os.path.exists(filepath):
+                items.append((image_key, filepath))
+
+        self.template_preloader = TemplatePreloader(
+            self.decode_image_state,
+            on_progress=lambda done, total: self.root.after(0, self.update_preload_status, done, total)
+        )
+        self.template_preloader.start(items)
+        self.update_preload_status(0, len(items))
+
+    def cancel_template_preload(self):
+        if self.template_preloader:
+            self.template_preloader.cancel()
+            self.template_preloader = None
+        self.update_preload_status(None, None)
+
+    def update_preload_status(self, done, total):
+        if not hasattr(self, 'lbl_preload_status'):
+            return
+        if done is None:
+            text = "Templates: off"
+        elif done >= total:
+            text = "Templates ready"
         else:
-            logging.error(f"'{filename}' not found at {filepath}")
+            text = f"Templates {done}/{total}"
+        self.lbl_preload_status.config(text=text)
 
     def center_image(self, image_key):
         if image_key in self.images:
@@ -678,56 +1047,452 @@ class Orthy:
             image_state.offset_x = (canvas_width / 2) + 156
             image_state.offset_y = (canvas_height / 2) + 100
 
-    def draw_images(self):
-        self.canvas.delete("all")
+    def request_redraw(self, image_name=None, content=True, region=None):
+        """
+        Schedule a redraw instead of rendering synchronously. Requests made
+        before the next frame are coalesced; image_name limits the work to one
+        layer, content=False means only its position changed, and region is a
+        canvas rectangle whose layers should be re-checked.
+        """
+        self.frame_scheduler.request(image_name, content, region)
+
+    def render_frame(self, dirty, region):
+        """
+        Frame scheduler callback: refresh the dirty layers (all when dirty is
+        None), then any culled layer whose bounding box meets the changed region.
+        """
+        if self.canvas is None:
+            return
+        self.latency.frame_started()
+        try:
+            if self.render_mode == 'composite':
+                self.draw_composite()
+            elif dirty is None:
+                self.draw_layers()
+            else:
+                self.draw_dirty_layers(dirty, region)
+            with stage(self.latency.frame_timings, 'memory'):
+                self.memory_manager.enforce(self.images, keep=self.active_image_name)
+        finally:
+            self.latency.frame_finished(self.canvas)
+
+    def draw_dirty_layers(self, dirty, region):
+        for image_name, content_changed in dirty.items():
+            image_state = self.images.get(image_name)
+            if not image_state:
+                continue
+            region.add(image_state.screen_bbox)
+            if not image_state.visible:
+                self.hide_layer(image_state)
+            elif (content_changed or image_state.canvas_item_id is None
+                  or image_state.culled or image_state.tiles):
+                # Tiled layers pick their visible tiles again even when only moved.
+                self.draw_image(image_state)
+            else:
+                self.place_image_items(image_state)
+            region.add(image_state.screen_bbox)
+
+        if not region:
+            return
+        for image_name, image_state in self.images.items():
+            if (image_name not in dirty and image_state.visible and image_state.culled
+                    and region.intersects(image_state.screen_bbox)):
+                self.draw_image(image_state)
+
+    def get_viewport(self):
+        """Canvas rectangle currently on screen."""
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # Not mapped yet; the image window always spans the screen.
+            width, height = self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+        return (0, 0, width, height)
+
+    def note_interaction(self):
+        """
+        Called by input handlers: render with the engine's interactive filter
+        until input has been idle for settle_delay_ms, then re-render once at
+        full quality.
+        """
+        self.render_engine.interacting = True
+        if self.settle_after_id is not None:
+            self.root.after_cancel(self.settle_after_id)
+        self.settle_after_id = self.root.after(self.settle_delay_ms, self.settle_interaction)
+
+    def settle_interaction(self):
+        self.settle_after_id = None
+        self.render_engine.interacting = False
+        if self.render_mode == 'composite':
+            # Layers have no canvas images of their own; re-compose if any input is interactive-quality.
+            if self.render_engine.composite_needs_settle():
+                self.request_redraw()
+            return
+        # Only layers last drawn with the interactive filter need a settled render.
+        for image_name, image_state in self.images.items():
+            if image_state.visible and self.needs_settled_render(image_state):
+                self.request_redraw(image_name)
+
+    def needs_settled_render(self, image_state):
+        """True if the layer's canvas image, or any of its tiles, shows an interactive-quality render."""
+        keys = [image_state.display_key] + [key for _, _, key in image_state.tiles.values()]
+        return any(key and key[2] != self.render_engine.settle_resample for key in keys)
+
+    def cancel_settle(self):
+        if self.settle_after_id is not None:
+            self.root.after_cancel(self.settle_after_id)
+            self.settle_after_id = None
+        self.render_engine.interacting = False
+
+    def draw_layers(self):
+        # Canvas items are retained per layer; hidden layers keep their items
+        # (and stacking order) but not their PhotoImages.
         for image_state in self.images.values():
             if image_state.visible:
                 self.draw_image(image_state)
-        self.image_window.update_idletasks()
-
+            else:
+                self.hide_layer(image_state)
 
     def draw_image(self, image_state):
-        img = image_state.image_original.copy()
-        if image_state.image_transparency_level < 1.0:
-            alpha = img.getchannel('A')
-            alpha = alpha.point(lambda p: int(p * image_state.image_transparency_level))
-            img.putalpha(alpha)
-
-        # For all images except the Ruler image, apply an additional 50% scale.
-        if image_state.name != "Ruler":
-            new_width = int(img.width * image_state.scale * 0.7)
-            new_height = int(img.height * image_state.scale * 0.7)
-        else:
-            new_width = int(img.width * image_state.scale)      
-            new_height = int(img.height * image_state.scale)
-        img = img.resize((new_width, new_height), Image.LANCZOS)
+        # The bitmap only depends on the linear part of the layer matrix, so a
+        # layer keeps its last PhotoImage until scale, angle, flips or
+        # transparency change; a transform seen before comes from the cache.
+        # While input is arriving, layers are drawn with the cheaper interactive
+        # filter unless a settled render is already cached; only settled renders
+        # are stored. Anything not cached is rendered on the render worker and
+        # shown by on_layer_rendered, keeping the Tk thread free for input.
+        viewport = self.get_viewport()
+        layout = self.render_engine.layout(image_state, viewport)
+        if layout is None:
+            # Entirely off-screen: keep the item hidden and skip rasterizing.
+            self.hide_image_items(image_state)
+            return
 
-        if image_state.is_flipped_horizontally:
-            img = img.transpose(Image.FLIP_LEFT_RIGHT)
-        if image_state.is_flipped_vertically:
-            img = img.transpose(Image.FLIP_TOP_BOTTOM)
+        if should_tile(layout.size, viewport):
+            self.draw_tiles(image_state, layout, viewport)
+            return
+        if image_state.tiles:
+            self.clear_tiles(image_state)
+
+        current_keys = self.render_engine.current_keys(layout)
+        render_key = current_keys[1]
+        if image_state.image_display is not None and image_state.display_key in current_keys:
+            # Back to what is already shown: a render still running for an
+            # intermediate state must not replace it.
+            self.cancel_render(image_state)
+            self.present_layer(image_state, layout)
+            return
+        cached = self.render_engine.cached_layer(image_state, layout)
+        if cached:
+            self.cancel_render(image_state)
+            self.present_layer(image_state, layout, cached)
+        elif self.render_worker is None:
+            with stage(self.latency.frame_timings, 'render'):
+                rendered = self.render_engine.layer_raster(image_state, layout)
+            self.present_layer(image_state, layout, rendered)
+        elif self.render_worker.pending_tag(image_state.name) != render_key:
+            # Until the render arrives the layer keeps showing its previous frame.
+            self.render_worker.submit(
+                image_state.name, render_key, self.render_engine.render_detached, image_state, layout,
+                on_done=lambda rendered: self.on_layer_rendered(image_state, layout, rendered)
+            )
 
-        if image_state.rotation_point:
-            rotation_center = (
-                image_state.rotation_point[0] - (image_state.offset_x - img.width / 2),
-                image_state.rotation_point[1] - (image_state.offset_y - img.height / 2)
+    def present_layer(self, image_state, layout, rendered=None):
+        """Show the layer's canvas image at layout, first swapping in rendered = (image, key) if given."""
+        if rendered is not None:
+            img, image_state.display_key = rendered
+            # Same-sized frames are pasted into the layer's existing PhotoImage.
+            with stage(self.latency.frame_timings, 'photo'):
+                image_state.image_display = self.photo_pool.update(image_state.image_display, img)
+
+        if image_state.canvas_item_id is None:
+            image_state.canvas_item_id = self.canvas.create_image(
+                *layout.position, image=image_state.image_display, anchor='nw'
             )
-            img = img.rotate(image_state.angle, expand=True, center=rotation_center)
+            self.restack_new_item(image_state)
         else:
-            img = img.rotate(image_state.angle, expand=True)
+            self.canvas.itemconfigure(
+                image_state.canvas_item_id, image=image_state.image_display, state='normal'
+            )
+        self.place_image_items(image_state, layout.position)
 
-        image_state.image_display = ImageTk.PhotoImage(img)
-        self.canvas.create_image(
-            image_state.offset_x, image_state.offset_y, image=image_state.image_display
-        )
+    def cancel_render(self, image_state):
+        """Drop the layer's queued render and the result of its running one."""
+        if self.render_worker:
+            self.render_worker.cancel(image_state.name)
+
+    def on_layer_rendered(self, image_state, layout, rendered):
+        """Render worker callback on the Tk thread: show a finished layer raster."""
+        layout = self.result_layout(image_state, layout, tiled=False)
+        if layout is not None:
+            self.present_layer(image_state, layout, rendered)
+            self.settle_late_result(image_state)
+
+    def settle_late_result(self, image_state):
+        """
+        A render started during interaction can arrive after settle_interaction
+        ran; give such an interactive-quality result its full-quality redraw.
+        """
+        if not self.render_engine.interacting and self.needs_settled_render(image_state):
+            self.request_redraw(image_state.name)
+
+    def result_layout(self, image_state, layout, tiled):
+        """
+        Layout at which to show a worker result rendered for layout, or None
+        when the result is stale: the layer was removed, hidden or culled, the
+        render mode changed, or it switched between tiles and a whole raster.
+        A layer that has only moved since shows the result at its new
+        position. Results for an older transform or transparency are still
+        shown while a newer render is queued to replace them; with none
+        queued they are dropped and the layer is redrawn.
+        """
+        if (self.canvas is None or self.render_mode != 'layers' or not image_state.visible
+                or self.images.get(image_state.name) is not image_state):
+            return None
+        viewport = self.get_viewport()
+        current = self.render_engine.layout(image_state, viewport)
+        if current is None:
+            self.hide_image_items(image_state)
+            return None
+        if should_tile(current.size, viewport) != tiled:
+            return None
+        if current.geometry == layout.geometry and current.level == layout.level:
+            return current
+        if self.render_worker.pending_tag(image_state.name) is None:
+            self.request_redraw(image_state.name)
+            return None
+        return layout
 
+    def set_render_mode(self, mode):
+        """
+        'layers' shows one canvas image per layer; 'composite' blends all
+        visible layers into a single frame with NumPy. Returns True if the
+        mode is now active.
+        """
+        if mode == 'composite' and not numpy_available():
+            logging.warning("NumPy is not installed; staying in per-layer render mode.")
+            return False
+        if mode == self.render_mode:
+            return True
+        self.render_mode = mode
+        if self.canvas is not None:
+            if mode == 'composite':
+                for image_state in self.images.values():
+                    self.hide_layer(image_state)
+            else:
+                self.clear_composite()
+        logging.info(f"Render mode set to '{mode}'.")
+        self.request_redraw()
+        return True
+
+    def draw_composite(self):
+        """
+        Composite mode: blend every visible layer, bottom first, into one
+        viewport-sized frame and show it as a single canvas image. Layers
+        below and above the active one are cached as two sums, so dragging the
+        active layer re-blends only the area it moved over, and a frame in
+        which nothing changed skips the PhotoImage update.
+        """
+        for image_state in self.images.values():
+            if not image_state.visible:
+                self.hide_image_items(image_state)
+        with stage(self.latency.frame_timings, 'composite'):
+            changed = self.render_engine.compose_frame(self.images, self.active_image_name, self.get_viewport())
+        if changed is not False or self.composite_photo is None:
+            with stage(self.latency.frame_timings, 'photo'):
+                self.composite_photo = self.photo_pool.update(self.composite_photo,
+                                                              self.render_engine.composite_image())
+        if self.composite_item_id is None:
+            self.composite_item_id = self.canvas.create_image(0, 0, image=self.composite_photo, anchor='nw')
+            self.canvas.tag_lower(self.composite_item_id)
+        else:
+            self.canvas.itemconfigure(self.composite_item_id, image=self.composite_photo, state='normal')
+        for image_state in self.images.values():
+            if image_state.visible:
+                self.place_marker(image_state, self.composite_item_id)
+
+    def clear_composite(self):
+        """Remove the composite frame from the canvas and drop its buffers."""
+        if self.composite_item_id is not None:
+            self.canvas.delete(self.composite_item_id)
+            self.composite_item_id = None
+        self.photo_pool.release(self.composite_photo)
+        self.composite_photo = None
+        self.render_engine.reset_composite()
+
+    def draw_tiles(self, image_state, layout, viewport):
+        """
+        Draw a raster much larger than the viewport as screen-space tiles of
+        tile_size pixels anchored to the raster origin. Only tiles meeting the
+        viewport are rendered and shown, so work and memory follow the screen
+        size rather than the source size. The layer's own canvas item stays
+        hidden and only keeps the layer's place in the stacking order.
+        """
+        if image_state.canvas_item_id is None:
+            image_state.canvas_item_id = self.canvas.create_image(*layout.position, anchor='nw', state='hidden')
+            self.restack_new_item(image_state)
+        elif image_state.image_display is not None:
+            self.canvas.itemconfigure(image_state.canvas_item_id, image='', state='hidden')
+            self.photo_pool.release(image_state.image_display)
+            image_state.image_display = None
+            image_state.display_key = None
+
+        visible = self.render_engine.layer_tiles(layout, viewport)
+        for tile in set(image_state.tiles) - set(visible):
+            item_id, photo, _ = image_state.tiles.pop(tile)
+            self.canvas.delete(item_id)
+            self.photo_pool.release(photo)
+
+        missing = []
+        for tile in visible:
+            _, photo, display_key = image_state.tiles.get(tile, (None, None, None))
+            if photo is not None and display_key in self.render_engine.current_keys(layout, tile):
+                self.present_tile(image_state, layout, tile)
+                continue
+            cached = self.render_engine.cached_tile(image_state, layout, *tile)
+            if cached:
+                self.present_tile(image_state, layout, tile, cached)
+            elif self.render_worker is None:
+                with stage(self.latency.frame_timings, 'render'):
+                    rendered = self.render_engine.tile_raster(image_state, layout, *tile)
+                self.present_tile(image_state, layout, tile, rendered)
+            else:
+                # Keep showing the tile's previous frame until its render arrives.
+                self.present_tile(image_state, layout, tile)
+                missing.append(tile)
+
+        tag = (self.render_engine.current_keys(layout)[1], tuple(missing))
+        if not missing:
+            self.cancel_render(image_state)
+        elif self.render_worker.pending_tag(image_state.name) != tag:
+            self.render_worker.submit(
+                image_state.name, tag, self.render_engine.render_tiles_detached, image_state, layout, missing,
+                on_done=lambda rendered: self.on_tiles_rendered(image_state, layout, rendered)
+            )
+        self.place_image_items(image_state, layout.position)
+
+    def present_tile(self, image_state, layout, tile, rendered=None):
+        """Show one tile at its place in layout, first swapping in rendered = (image, key) if given."""
+        item_id, photo, display_key = image_state.tiles.get(tile, (None, None, None))
+        if rendered is not None:
+            img, display_key = rendered
+            with stage(self.latency.frame_timings, 'photo'):
+                photo = self.photo_pool.update(photo, img)
+        if photo is None:
+            return
+        x0, y0, _, _ = self.render_engine.tile_rect(layout, *tile)
+        tile_position = (layout.position[0] + x0, layout.position[1] + y0)
+        if item_id is None:
+            item_id = self.canvas.create_image(
+                *tile_position, image=photo, anchor='nw', tags=(image_state.tile_tag,)
+            )
+            self.canvas.tag_raise(item_id, image_state.canvas_item_id)
+        else:
+            self.canvas.itemconfigure(item_id, image=photo, state='normal')
+            self.canvas.coords(item_id, *tile_position)
+        image_state.tiles[tile] = (item_id, photo, display_key)
+
+    def on_tiles_rendered(self, image_state, layout, rendered):
+        """Render worker callback on the Tk thread: show finished tiles that are still on screen."""
+        current = self.result_layout(image_state, layout, tiled=True)
+        if current is None:
+            return
+        visible = set(self.render_engine.layer_tiles(current, self.get_viewport()))
+        for tile, tile_rendered in rendered.items():
+            if current is layout or tile in visible:
+                self.present_tile(image_state, current, tile, tile_rendered)
+        self.place_image_items(image_state, current.position)
+        self.settle_late_result(image_state)
+
+    def clear_tiles(self, image_state):
+        """Delete a layer's tile items and return their PhotoImages to the pool."""
+        for item_id, photo, _ in image_state.tiles.values():
+            self.canvas.delete(item_id)
+            self.photo_pool.release(photo)
+        image_state.tiles.clear()
+
+    def restack_new_item(self, image_state):
+        """New canvas items land on top; lower this one beneath the layers that follow it."""
+        later_layers = list(self.images.values())
+        for later_state in later_layers[later_layers.index(image_state) + 1:]:
+            if later_state.canvas_item_id is not None:
+                self.canvas.tag_lower(image_state.canvas_item_id, later_state.canvas_item_id)
+                break
+
+    def place_image_items(self, image_state, position=None):
+        """Position the layer's canvas image and rotation-point marker."""
+        if position is None:
+            layout = self.render_engine.layout(image_state, self.get_viewport())
+            if layout is None:
+                self.hide_image_items(image_state)
+                return
+            position = layout.position
+        self.canvas.coords(image_state.canvas_item_id, *position)
+        self.place_marker(image_state,
+                          image_state.tile_tag if image_state.tiles else image_state.canvas_item_id)
+
+    def place_marker(self, image_state, above):
+        """Show the layer's rotation-point marker, if it has one, just above the item or tag above."""
         if image_state.rotation_point:
             radius = 1.5
-            self.canvas.create_oval(
+            marker_coords = (
                 image_state.rotation_point[0] - radius, image_state.rotation_point[1] - radius,
-                image_state.rotation_point[0] + radius, image_state.rotation_point[1] + radius,
-                fill='red', outline=''
+                image_state.rotation_point[0] + radius, image_state.rotation_point[1] + radius
             )
+            if image_state.marker_item_id is None:
+                image_state.marker_item_id = self.canvas.create_oval(
+                    *marker_coords, fill='red', outline=''
+                )
+            else:
+                self.canvas.coords(image_state.marker_item_id, *marker_coords)
+                self.canvas.itemconfigure(image_state.marker_item_id, state='normal')
+                self.canvas.tag_raise(image_state.marker_item_id, above)
+        elif image_state.marker_item_id is not None:
+            self.canvas.itemconfigure(image_state.marker_item_id, state='hidden')
+
+    def hide_layer(self, image_state):
+        """
+        Hide a layer and give its PhotoImages back to the pool. A layer the
+        user hid also releases its derived caches, so showing it again renders
+        from the working copy; layers hidden by composite mode keep theirs.
+        """
+        self.cancel_render(image_state)
+        if not image_state.visible:
+            self.release_hidden_caches(image_state)
+        self.hide_image_items(image_state)
+        if image_state.tiles:
+            self.clear_tiles(image_state)
+        if image_state.image_display is not None:
+            # Detach the image from the item before the pool can hand it out again.
+            self.canvas.itemconfigure(image_state.canvas_item_id, image='')
+            self.photo_pool.release(image_state.image_display)
+            image_state.image_display = None
+            image_state.display_key = None
+
+    def release_hidden_caches(self, image_state):
+        # A cancelled render may still hold the layer; the next frame (or the
+        # memory manager, which evicts hidden layers first) tries again.
+        if not image_state.render_lock.acquire(blocking=False):
+            return
+        try:
+            released = image_state.release_caches()
+        finally:
+            image_state.render_lock.release()
+        if released:
+            logging.debug(f"Released {released / 2**20:.1f} MB of caches from hidden '{image_state.name}'.")
+
+    def hide_image_items(self, image_state):
+        for item_id in (image_state.canvas_item_id, image_state.marker_item_id):
+            if item_id is not None:
+                self.canvas.itemconfigure(item_id, state='hidden')
+        if image_state.tiles:
+            self.canvas.itemconfigure(image_state.tile_tag, state='hidden')
+
+    def translate_image(self, image_state, dx, dy):
+        """
+        Move a layer without re-rasterizing it. Pure translations only shift the
+        retained canvas item on the next frame.
+        """
+        image_state.translate(dx, dy)
+        self.request_redraw(image_state.name, content=False)
 
     ########################################################################
     # Image Toggling
@@ -771,7 +1536,7 @@ class Orthy:
                 # Hide it
                 self.images[image_key].visible = False
                 self.additional_images_visibility[image_key] = False
-                self.draw_images()
+                self.request_redraw()
                 logging.info(f"{image_key} image hidden.")
 
                 # If ImageControl is active, turn it off
@@ -785,13 +1550,13 @@ class Orthy:
                     self.images[self.active_image_name].visible = True
                 self.previous_active_image_name = None
 
-                self.draw_images()
+                self.request_redraw()
                 return
             else:
                 # The image_key matches active image, but it's not currently visible => show it
                 self.images[image_key].visible = True
                 self.additional_images_visibility[image_key] = True
-                self.draw_images()
+                self.request_redraw()
                 logging.info(f"{image_key} image made visible again.")
 
                 # If ImageControl is off, we can turn it on
@@ -813,7 +1578,7 @@ class Orthy:
                 self.load_default_image(image_key, filename)
             else:
                 self.images[image_key].visible = True
-                self.draw_images()
+                self.request_redraw()
 
             self.additional_images_visibility[image_key] = True
             logging.info(f"{image_key} image made visible.")
@@ -833,7 +1598,7 @@ class Orthy:
             if not self.image_window_visible:
                 self.toggle_image_window()
 
-        self.draw_images()
+        self.request_redraw()
 
     ########################################################################
     # Image Helpers
@@ -849,11 +1614,6 @@ class Orthy:
         )
         if not filepath:
             return
-        image_original, svg_content = self.open_image_file(filepath)
-        if not image_original:
-            messagebox.showerror("Load Failed", "Failed to load the selected image.")
-            return
-
         default_name = os.path.splitext(os.path.basename(filepath))[0]
         image_name = simpledialog.askstring("Image Name", "Enter a unique name for the image:", initialvalue=default_name)
         if not image_name:
@@ -862,19 +1622,22 @@ class Orthy:
 
         original_name = image_name
         counter = 1
-        while image_name in self.images:
+        while image_name in self.images or image_name in self.pending_loads.values():
             image_name = f"{original_name}_{counter}"
             counter += 1
 
+        self.load_image_async(filepath, image_name, self.on_user_image_loaded)
+
+    def on_user_image_loaded(self, image_name, filepath, image_state):
         if self.active_image_name and self.active_image_name in self.images:
             self.images[self.active_image_name].visible = False
 
-        image_state = ImageState(image_original, image_name, svg_content=svg_content)
         self.images[image_name] = image_state
         self.active_image_name = image_name
         self.images[self.active_image_name].visible = True
-        self.draw_images()
-        logging.info(f"User-loaded image '{image_name}' loaded from '{filepath}'.")
+        self.request_redraw()
+        logging.info(f"User-loaded image '{image_name}' loaded from '{filepath}' "
+                     f"({image_state.resident_bytes()['total'] / 2**20:.1f} MB resident).")
 
         ic_plugin = self.plugin_loader.get_plugin("ImageControl")
         if ic_plugin:
@@ -888,6 +1651,16 @@ class Orthy:
     ########################################################################
     def on_close(self):
         try:
+            self.frame_scheduler.cancel()
+            self.cancel_settle()
+            if self.template_preloader:
+                self.template_preloader.cancel()
+            self.image_loader.shutdown()
+            if self.render_worker:
+                self.render_worker.shutdown()
+            if self.profiler.stop():
+                self.save_profile()
+            logging.info(f"Frame stats: {self.frame_scheduler.stats()}")
             if hasattr(self, 'plugin_loader'):
                 self.plugin_loader.cleanup()
             if hasattr(self, 'image_window'):
@@ -923,7 +1696,7 @@ class Orthy:
                 self.btn_hide_show_image.config(text="Hide")
             logging.info("Image window shown.")
             self.image_window.update_idletasks()
-            self.draw_images()
+            self.request_redraw()
 
     def toggle_image_control_from_plugin(self):
         ic_plugin = self.plugin_loader.get_plugin("ImageControl")
@@ -972,66 +1745,18 @@ class Orthy:
     ########################################################################
     def apply_transformations_to_svg(self, image_state):
         try:
-            svg_content = image_state.svg_content
-            if not svg_content:
-                return None
-            parser = etree.XMLParser(ns_clean=True, recover=True, encoding='utf-8')
-            svg_root = etree.fromstring(svg_content.encode('utf-8'), parser=parser)
-
-            transforms = []
-            if image_state.is_flipped_horizontally or image_state.is_flipped_vertically:
-                scale_x = -1 if image_state.is_flipped_horizontally else 1
-                scale_y = -1 if image_state.is_flipped_vertically else 1
-                transforms.append(f"scale({scale_x},{scale_y})")
-
-            if image_state.scale != 1.0:
-                transforms.append(f"scale({image_state.scale})")
-
-            if image_state.angle != 0:
-                if image_state.rotation_point:
-                    cx, cy = image_state.rotation_point
-                else:
-                    cx = image_state.offset_x
-                    cy = image_state.offset_y
-                transforms.append(f"rotate({image_state.angle},{cx},{cy})")
-
-            transforms.append(f"translate({image_state.offset_x},{image_state.offset_y})")
-            transform_str = ' '.join(transforms)
-            g = etree.Element("g")
-            g.set("transform", transform_str)
-
-            for child in list(svg_root):
-                svg_root.remove(child)
-                g.append(child)
-
-            svg_root.append(g)
-            if image_state.image_transparency_level != 1.0:
-                g.set("opacity", str(image_state.image_transparency_level))
-
-            return etree.tostring(svg_root, encoding='utf-8', method='xml', pretty_print=True).decode('utf-8')
+            return self.render_engine.export_svg(image_state)
         except Exception as e:
             logging.error(f"Error applying transformations to SVG: {e}")
             return None
 
     def get_transformed_image(self, image_state):
+        """
+        Export the layer exactly as it is drawn, using the same matrix as the
+        canvas. Photos downscaled on load are rendered from the full-resolution file.
+        """
         try:
-            img = image_state.image_original.copy()
-            if image_state.is_flipped_horizontally:
-                img = img.transpose(Image.FLIP_LEFT_RIGHT)
-            if image_state.is_flipped_vertically:
-                img = img.transpose(Image.FLIP_TOP_BOTTOM)
-
-            img = img.resize(
-                (int(img.width * image_state.scale), int(img.height * image_state.scale)),
-                Image.LANCZOS
-            )
-            img = img.rotate(-image_state.angle, expand=True)
-            if image_state.image_transparency_level < 1.0:
-                alpha = img.getchannel('A')
-                alpha = alpha.point(lambda p: int(p * image_state.image_transparency_level))
-                img.putalpha(alpha)
-
-            return img
+            return self.render_engine.export_image(image_state)
         except Exception as e:
             logging.error(f"Error getting transformed image: {e}")
             return None
@@ -1045,6 +1770,25 @@ class Orthy:
         clear data, and reset internal state.
         """
         logging.info("Resetting all resources and plugins...")
+        logging.info(f"Frame stats before reset: {self.frame_scheduler.stats()}")
+        self.log_image_memory()
+        compositor = self.render_engine.compositor
+        if compositor:
+            logging.info(f"Composites: {compositor.full_composites} full, "
+                         f"{compositor.partial_composites} partial, "
+                         f"{compositor.skipped_composites} skipped.")
+        self.frame_scheduler.cancel()
+        self.cancel_settle()
+        self.cancel_template_preload()
+        if self.resize_after_id is not None:
+            self.root.after_cancel(self.resize_after_id)
+            self.resize_after_id = None
+        self.image_loader.cancel_pending()
+        if self.render_worker:
+            logging.info(self.render_worker.stats())
+            self.render_worker.cancel_all()
+        self.pending_loads.clear()
+        self.loading_placeholder_id = None
         try:
             if hasattr(self, 'plugin_loader'):
                 for plugin_name, plugin in self.plugin_loader.plugins.items():
@@ -1067,6 +1811,7 @@ class Orthy:
             self.image_window = None
 
         self.images.clear()
+        self.photo_pool.clear()
         self.active_image_name = None
         self.previous_active_image_name = None
         self.is_dragging = False
@@ -1094,6 +1839,7 @@ class Orthy:
         self.plugin_loader.load_plugins(self)
 
         self.setup_UI()
+        self.root.after_idle(self.start_template_preload)
 
 ##################aaadd############################################################
 # Main Entry Point
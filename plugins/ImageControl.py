@@ -126,7 +126,7 @@ class ImageControlPlugin(OrthyPlugin):
                 elif c == 't':
                     self.fine_zoom_in_thread_safe()
                 elif c == 'f':
-                    self.flip_image_vertical()
+                    self.run_on_tk(self.flip_image_vertical)
         except AttributeError:
             if key in (keyboard.Key.alt_l, keyboard.Key.alt_r):
                 self.alt_pressed = True
@@ -139,37 +139,52 @@ class ImageControlPlugin(OrthyPlugin):
         if key == keyboard.Key.shift:
             self.shift_pressed = False
 
+    def run_on_tk(self, function, *args):
+        """
+        Hand a key press from the pynput thread to the Tk thread. The latency
+        monitor times the hand-off from the moment the key arrived.
+        """
+        token = self.app.latency.input_event('key')
+        self.app.canvas.after(0, self._dispatch_on_tk, token, function, *args)
+
+    def _dispatch_on_tk(self, token, function, *args):
+        self.app.latency.dispatched(token)
+        function(*args)
+
     def rotate_image(self, angle_increment):
-        self.app.canvas.after(0, self.adjust_rotation, angle_increment)
+        self.run_on_tk(self.adjust_rotation, angle_increment)
 
     def fine_zoom_in_thread_safe(self):
-        self.app.canvas.after(0, self.fine_zoom_in)
+        self.run_on_tk(self.fine_zoom_in)
 
     def fine_zoom_out_thread_safe(self):
-        self.app.canvas.after(0, self.fine_zoom_out)
+        self.run_on_tk(self.fine_zoom_out)
 
     def toggle_rotation_point_mode_thread_safe(self):
-        self.app.canvas.after(0, self.toggle_rotation_point_mode)
+        self.run_on_tk(self.toggle_rotation_point_mode)
 
     def move_image(self, direction):
-        self.app.canvas.after(0, self._move_image_main_thread, direction)
+        self.run_on_tk(self._move_image_main_thread, direction)
 
     def _move_image_main_thread(self, direction):
         active_image = self.app.get_active_image()
         if not active_image:
             return
+        self.app.note_interaction()
         move_amount = 10 if self.shift_pressed else 2
+        dx, dy = 0, 0
         if direction == 'up':
-            active_image.offset_y -= move_amount
+            dy = -move_amount
         elif direction == 'down':
-            active_image.offset_y += move_amount
+            dy = move_amount
         elif direction == 'left':
-            active_image.offset_x -= move_amount
+            dx = -move_amount
         elif direction == 'right':
-            active_image.offset_x += move_amount
+            dx = move_amount
 
+        # Pure translation: shift the existing canvas item, no re-rasterizing.
+        self.app.translate_image(active_image, dx, dy)
         logging.info(f"Moved image '{active_image.name}' {direction} by {move_amount} pixels.")
-        self.app.draw_images()
 
     def cleanup(self):
         """
@@ -202,9 +217,9 @@ class ImageControlPlugin(OrthyPlugin):
             logging.info("Rotation point mode enabled.")
         else:
             self.app.is_rotation_point_mode = False
-            active_image.rotation_point = None
+            active_image.set_rotation_point(None)
             logging.info("Rotation point mode disabled and rotation point reset.")
-        self.app.draw_images()
+        self.app.request_redraw(active_image.name)
 
     def zoom_in(self):
         self.adjust_zoom(0.05)
@@ -222,10 +237,11 @@ class ImageControlPlugin(OrthyPlugin):
         active_image = self.app.get_active_image()
         if not active_image:
             return
+        self.app.note_interaction()
         active_image.scale = max(0.1, min(active_image.scale + amount, 10.0))
         active_image.scale_log = math.log2(active_image.scale)
         logging.info(f"Adjusted zoom for image '{active_image.name}' to scale {active_image.scale}.")
-        self.app.draw_images()
+        self.app.request_redraw(active_image.name)
 
     def fine_rotate_clockwise(self):
         self.adjust_rotation(0.5)
@@ -237,9 +253,10 @@ class ImageControlPlugin(OrthyPlugin):
         active_image = self.app.get_active_image()
         if not active_image:
             return
+        self.app.note_interaction()
         active_image.angle = (active_image.angle + angle_increment) % 360
         logging.info(f"Rotated image '{active_image.name}' by {angle_increment} degrees.")
-        self.app.draw_images()
+        self.app.request_redraw(active_image.name)
 
     def flip_image_horizontal(self):
         active_image = self.app.get_active_image()
@@ -247,7 +264,7 @@ class ImageControlPlugin(OrthyPlugin):
             return
         active_image.is_flipped_horizontally = not active_image.is_flipped_horizontally
         logging.info(f"Image '{active_image.name}' flipped horizontally.")
-        self.app.draw_images()
+        self.app.request_redraw(active_image.name)
 
     def flip_image_vertical(self):
         active_image = self.app.get_active_image()
@@ -255,4 +272,4 @@ class ImageControlPlugin(OrthyPlugin):
             return
         active_image.is_flipped_vertically = not active_image.is_flipped_vertically
         logging.info(f"Image '{active_image.name}' flipped vertically.")
-        self.app.draw_images()
+        self.app.request_redraw(active_image.name)